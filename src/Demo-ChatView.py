@@ -0,0 +1,41 @@
+from FletWidgetsLibrary import ChatView
+from flet import (
+    TextField,
+    IconButton,
+    Icons,
+    Page,
+    Row,
+    app,
+)
+import asyncio
+
+# Demo Example
+def main(page:Page):
+    
+    chat = ChatView(expand=True, max_messages=1000)
+
+    # Fill the chat with a long conversation
+    for i in range(300):
+        chat.add_message(f"Question number **{i}**", from_user=True)
+        chat.add_message(f"Answer number **{i}**\n\n- first point\n- second point")
+
+    async def answer(question: str):
+        # Simulates the tokens of a model
+        for word in f"You said: *{question}*. Here is a streamed answer, word by word.".split():
+            await asyncio.sleep(0.05)
+            yield word + " "
+
+    def send(e):
+        if not field.value:
+            return
+        chat.add_message(field.value, from_user=True)
+        chat.add_message(answer(field.value))
+        field.value = ""
+        field.update()
+
+    field = TextField(hint_text="Write a message", expand=True, on_submit=send)
+    page.add(
+        chat,
+        Row([field, IconButton(Icons.SEND, on_click=send)]),
+    )
+app(target=main)
@@ -0,0 +1,52 @@
+from FletWidgetsLibrary import TreeGrid, TreeGridColumn, TreeNode, TreeAggregate
+from flet import *
+
+def main(page: Page):
+    
+    # Create a big example tree
+    root_nodes = [
+        TreeNode(
+            name=f"Project {p}",
+            children=[
+                TreeNode(
+                    name=f"src {p}.{f}",
+                    children=[
+                        TreeNode(
+                            name=f"file{i}.py",
+                            metadata={"size": (p * 31 + f * 7 + i) % 900 + 10, "owner": ["ana", "leo", "max"][i % 3]}
+                        )
+                        for i in range(200)
+                    ]
+                )
+                for f in range(5)
+            ]
+        )
+        for p in range(20)
+    ]
+    
+    # Declared columns (the first one holds the tree)
+    columns = [
+        TreeGridColumn("name", "Name", width=260),
+        TreeGridColumn("size", "Size", width=100, field="size", format=lambda v: f"{v} KB"),
+        TreeGridColumn("total", "Total", width=110, aggregate="size", format=lambda v: f"{int(v)} KB"),
+        TreeGridColumn("owner", "Owner", width=100, field="owner"),
+    ]
+    
+    grid = TreeGrid(
+        nodes=root_nodes,
+        columns=columns,
+        aggregates=[TreeAggregate("size", field="size", show_badge=False)],
+        viewport_height=500,
+        on_node_select=lambda node: print(f"Select Node: {node.name}"),
+    )
+    
+    toolbar = Row([
+        IconButton(Icons.EXPAND, on_click=lambda e: grid.expand_all()),
+        IconButton(Icons.EXPAND_LESS, on_click=lambda e: grid.collapse_all()),
+    ])
+    
+    page.on_keyboard_event = grid.handle_keyboard_event
+    
+    page.add(toolbar, Divider(), grid)
+
+app(target=main)
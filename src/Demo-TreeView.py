@@ -67,6 +67,9 @@ def main(page: Page):
         IconButton(Icons.EXPAND_LESS, on_click=lambda e: tree.collapse_all()),
     ])
     
+    # Arrow keys, Home/End and PageUp/PageDown move through the visible rows
+    page.on_keyboard_event = tree.handle_keyboard_event
+    
     page.add(toolbar, Divider(), tree)
 
 app(target=main)
\ No newline at end of file
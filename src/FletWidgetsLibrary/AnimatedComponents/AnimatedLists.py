@@ -14,7 +14,7 @@ from flet import (
     Text,
     Row,
 )
-import asyncio
+from .AnimationScheduler import AnimationScheduler
 
 class ListItem(Container):
     def __init__(
@@ -51,7 +51,7 @@ class ListItem(Container):
 
     def did_mount(self):
         """Se llama automáticamente cuando el control se monta en pantalla"""
-        self.page.run_task(self._animate_did_mount)
+        AnimationScheduler.get(self.page).start(self._animate_did_mount)
         self.content.controls[0].visible=self.parent.data != "ordened-list"
         self.content.controls[0].update()
         self.content.controls[1].visible=self.parent.data == "ordened-list"
@@ -60,9 +60,10 @@ class ListItem(Container):
 
     async def _animate_did_mount(self):
         """Anima la aparición del item"""
-        await asyncio.sleep(self.delay * self.index)  # pequeño delay escalonado
+        scheduler = AnimationScheduler.get(self.page)
+        await scheduler.sleep(self.delay * self.index)  # pequeño delay escalonado
         self.scale = Scale(1)
-        self.update()
+        scheduler.request_update(self)
 
 class UnorderedList(ListView):
     def __init__(
@@ -92,7 +93,7 @@ class UnorderedList(ListView):
         new_item = ListItem(index, item, color=self.item_color, delay=self.delay)
         self.controls.append(new_item)
         self.update()  # actualiza la vista (solo nuevo item)
-        self.page.run_task(new_item._animate_did_mount)
+        AnimationScheduler.get(self.page).start(new_item._animate_did_mount)
 
 class OrdenedList(ListView):
     def __init__(self, items: List[Control], spacing: int = 5, item_color: str = Colors.AMBER_700, delay: float = 0.01):
@@ -116,4 +117,4 @@ class OrdenedList(ListView):
         new_item = ListItem(index, item, color=self.item_color, delay=self.delay) if not isinstance(item, ListItem) else item
         self.controls.append(new_item)
         self.update()  # actualiza la vista (solo nuevo item)
-        self.page.run_task(new_item._animate_did_mount)
\ No newline at end of file
+        AnimationScheduler.get(self.page).start(new_item._animate_did_mount)
\ No newline at end of file
@@ -0,0 +1,155 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from flet import Control, Page
+import weakref
+import asyncio
+import heapq
+import time
+
+
+class AnimationScheduler:
+    """
+    A per-page animation clock for Flet.
+
+    Every animated component of a page waits on the same clock and queues
+    its changed controls here, so a page sends one update per frame no
+    matter how many widgets are animating.
+
+    Features:
+        - One scheduler per page (see `AnimationScheduler.get`).
+        - Configurable frame rate.
+        - Frame-aligned sleeps: animations due on the same tick advance together.
+        - The union of dirty controls goes out in a single `page.update()`.
+        - The clock only runs while something is waiting or dirty.
+        - Only a weak reference to the page is kept; the animations of a page
+          that disconnects or closes are cancelled.
+    """
+
+    _schedulers: "weakref.WeakKeyDictionary[Page, AnimationScheduler]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, page: Page, fps: int = 60):
+        """
+        Initialize the scheduler (prefer `AnimationScheduler.get(page)`).
+
+        Args:
+            page (Page): The page whose animations are driven.
+            fps (int): Maximum frames (updates) per second (default=60).
+        """
+        self._page_ref: "weakref.ref[Page]" = weakref.ref(page)
+        self.fps: int = fps
+        self._dirty: Dict[int, Control] = {}
+        self._waiters: List[tuple] = []  # Heap of (deadline, sequence, future)
+        self._sequence: int = 0
+        self._clock_running: bool = False
+
+    @property
+    def page(self) -> Optional[Page]:
+        """The page of the scheduler, or None once it has been freed."""
+        return self._page_ref()
+
+    @classmethod
+    def get(cls, page: Page, fps: int = None) -> "AnimationScheduler":
+        """
+        Return the scheduler of a page, creating it on first use.
+
+        Args:
+            page (Page): The page.
+            fps (int): If given, changes the frame rate of the scheduler.
+        """
+        scheduler = cls._schedulers.get(page)
+        if scheduler is None:
+            scheduler = cls._schedulers[page] = cls(page)
+        if fps is not None:
+            scheduler.fps = fps
+        return scheduler
+
+    def start(self, animation: Callable[..., Awaitable[Any]], *args):
+        """
+        Run an animation coroutine function on the page.
+
+        Args:
+            animation (Callable): Coroutine function that waits on this scheduler.
+        """
+        return self.page.run_task(animation, *args)
+
+    def request_update(self, *controls: Control):
+        """
+        Queue controls to be sent with the next frame.
+
+        Args:
+            *controls (Control): The controls that changed.
+        """
+        for control in controls:
+            self._dirty[id(control)] = control
+        self._ensure_clock()
+
+    async def sleep(self, seconds: float):
+        """
+        Wait at least `seconds`, waking up on a frame of the shared clock.
+
+        Args:
+            seconds (float): Minimum time to wait.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._sequence += 1
+        heapq.heappush(self._waiters, (time.monotonic() + max(seconds, 0), self._sequence, future))
+        self._ensure_clock()
+        await future
+
+    async def next_frame(self):
+        """Wait for the next frame."""
+        await self.sleep(0)
+
+    def close(self):
+        """Cancel every waiting animation and forget the page."""
+        waiters, self._waiters = self._waiters, []
+        for _, _, future in waiters:
+            future.cancel()
+        self._dirty.clear()
+
+        page = self.page
+        if page is not None and self._schedulers.get(page) is self:
+            del self._schedulers[page]
+
+    def _is_page_alive(self) -> bool:
+        page = self.page
+        # A disconnected page has an expiration date; a closed one has no connection
+        return page is not None and page.connection is not None and page.expires_at is None
+
+    def _ensure_clock(self):
+        if not self._clock_running:
+            self._clock_running = True
+            self.page.run_task(self._clock)
+
+    async def _clock(self):
+        """
+        Main clock loop.
+        Wakes the due animations, lets them run their step, then flushes once.
+        """
+        try:
+            while self._waiters or self._dirty:
+                if not self._is_page_alive():
+                    self.close()
+                    break
+                frame_start = time.monotonic()
+
+                while self._waiters and self._waiters[0][0] <= frame_start:
+                    future = heapq.heappop(self._waiters)[2]
+                    if not future.done():
+                        future.set_result(None)
+
+                # Woken animations run until their next wait
+                await asyncio.sleep(0)
+                self._flush()
+
+                elapsed = time.monotonic() - frame_start
+                await asyncio.sleep(max(0.0, 1 / self.fps - elapsed))
+        finally:
+            self._clock_running = False
+
+    def _flush(self):
+        """Send every queued control that is still on the page in one update."""
+        controls = [c for c in self._dirty.values() if c.page]
+        self._dirty.clear()
+        page = self.page
+        if controls and page is not None:
+            page.update(*controls)
@@ -1,26 +1,101 @@
-from typing import List, Union
+from typing import AsyncIterable, List, Optional, Union
 from flet import (
     MarkdownExtensionSet,
     MarkdownCodeTheme,
     BorderRadius,
+    OnScrollEvent,
     Container,
+    ListView,
     Markdown,
-    SnackBar,
     Colors,
     Border,
     Column,
     border,
-    Text,
 )
+from .AnimationScheduler import AnimationScheduler
+from .ToastQueue import ToastQueue
 import asyncio
+import bisect
+import time
+import re
+
+
+_WORD = re.compile(r"\S+\s*")
+_FENCE = re.compile(r" {0,3}(`{3,}|~{3,})")
+
+
+def _find_block_end(text: str, start: int, end: int, fence: Optional[str] = None) -> Optional[int]:
+    """
+    Find the end of the first complete Markdown block of `text[start:end]`.
+
+    A block is complete once a blank line follows it, or once its fenced code
+    block is closed. Blank lines inside fenced code do not end the block.
+    `fence` is the marker of a fenced code block already open at `start`.
+
+    Returns:
+        The offset right after the block, or None if it is still open.
+    """
+    has_content = fence is not None
+    line_start = start
+    while True:
+        line_end = text.find("\n", line_start, end)
+        if line_end == -1:
+            return None  # The last line may still grow
+        line = text[line_start:line_end]
+        line_start = line_end + 1
+
+        match = _FENCE.match(line)
+        if fence:
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence):
+                return line_start  # Closing fence
+        elif match:
+            fence = match.group(1)
+            has_content = True
+        elif not line.strip():
+            if has_content:
+                return line_start
+        else:
+            has_content = True
+
+
+def _find_open_fence(text: str, start: int, end: int, fence: Optional[str] = None) -> Optional[str]:
+    """
+    Find the fenced code block still open at the end of `text[start:end]`.
+    `fence` is the opening line of a code block already open at `start`.
+
+    Returns:
+        The opening line of the open code block, or None.
+    """
+    line_start = start
+    while line_start < end:
+        line_end = text.find("\n", line_start, end)
+        if line_end == -1:
+            line_end = end
+        line = text[line_start:line_end]
+        line_start = line_end + 1
+
+        match = _FENCE.match(line)
+        if fence:
+            marker = _FENCE.match(fence).group(1)
+            if match and match.group(1)[0] == marker[0] and len(match.group(1)) >= len(marker):
+                fence = None
+        elif match:
+            fence = line
+    return fence
 
 
 class AnimatedTextBubble(Container):
-    """Animated message bubble with Markdown support, typewriter animation, and a Copy button."""
+    """
+    Animated message bubble with Markdown support, typewriter animation, and a Copy button.
+    `texts` can also be an async iterator of text chunks (e.g. tokens of a model),
+    which are shown as they arrive (see `stream`).
+    Texts longer than `paginate_after` characters are shown without animation,
+    split into chunks that are only rendered when scrolled near them.
+    """
 
     def __init__(
         self,
-        texts: Union[str, List[str]],
+        texts: Union[str, List[str], AsyncIterable[str]],
         speed: int = 10,
         pause: float = 0,
         bgcolor: Colors = Colors.GREY_900,
@@ -28,11 +103,29 @@ class AnimatedTextBubble(Container):
         MarkdownCodeTheme: MarkdownCodeTheme = MarkdownCodeTheme.ATOM_ONE_DARK,
         ExtensionSet: MarkdownExtensionSet = MarkdownExtensionSet.GITHUB_WEB,
         border: Border = None,
+        fps: int = 15,
+        max_pending: int = 4096,
+        paginate_after: int = 20000,
+        chunk_size: int = 4000,
+        page_height: int = 600,
     ):
         super().__init__()
-        self.texts = texts if isinstance(texts, list) else [texts]
-        self.speed = speed
+        self._source = texts if hasattr(texts, "__aiter__") else None
+        if self._source is not None:
+            self.texts = []  # The streamed text is added once complete
+        else:
+            self.texts = texts if isinstance(texts, list) else [texts]
+        self.speed = speed  # Characters per second
         self.pause = pause
+        self.fps = fps  # Maximum updates per second while typing
+        self.max_pending = max_pending  # Streamed characters not yet shown before pausing the producer
+        self.completed = None  # asyncio future of the current stream
+        self._stream_parts = []  # Chunks received from the current stream
+        self._consumer = None  # Task that consumes the current stream
+        self._resume = None  # Future the consumer waits on while the bubble is unmounted
+        self.paginate_after = paginate_after  # Longer texts are shown as a paginated document
+        self.chunk_size = chunk_size  # Characters per Markdown chunk of a paginated document
+        self.page_height = page_height  # Height of the scrollable area of a paginated document
         self.running = False
         self.MarkdownTheme = MarkdownCodeTheme
         self.ExtensionSet = ExtensionSet
@@ -60,49 +153,256 @@ class AnimatedTextBubble(Container):
         )
         self.page.set_clipboard(clean_text)
 
-        # Mostrar notificación
-        self.page.overlay.append(
-            SnackBar(
-                content=Text("✅ Copied to clipboard", color=Colors.WHITE),
-                bgcolor=self.bgcolor,
-                open=True,
-                action="Close",
-                action_color=Colors.WHITE,
-            )
-        )
-        self.page.update()
+        # Show the notification (one SnackBar reused per page)
+        ToastQueue.get(self.page).show("✅ Copied to clipboard", bgcolor=self.bgcolor)
 
     def did_mount(self):
+        self.scheduler = AnimationScheduler.get(self.page)
         self.running = True
-        self.page.run_task(self._type_loop)
+        if self._source is not None:
+            if self._consumer is not None and not self._consumer.done():
+                # The consumer is still alive: only wake it up
+                self.page.loop.call_soon_threadsafe(self._wake_consumer)
+                return
+            # Starts the stream, or resumes it where the last unmount left it
+            if self.completed is None:
+                self.completed = self.page.loop.create_future()
+            self._consumer = self.scheduler.start(self._stream_text)
+        else:
+            self.scheduler.start(self._type_loop)
 
     def will_unmount(self):
         self.running = False
 
-    async def _type_text(self, full_text: str):
-        self.message_column.controls.clear()
-        self.update()
-
-        # Animación de aparición progresiva del markdown con soporte de links
-        partial_text = ""
-        md = Markdown(
-            value="",
+    def _create_markdown(self, value: str = "") -> Markdown:
+        return Markdown(
+            value=value,
             selectable=True,
             extension_set=self.ExtensionSet,
             code_theme=self.MarkdownTheme,
             on_tap_link=lambda e: self.page.launch_url(e.data),  # 🚀 abre el link
         )
+
+    def _new_block(self) -> Markdown:
+        """Append a new empty Markdown block at the end of the message"""
+        md = self._create_markdown()
         self.message_column.controls.append(md)
+        return md
+
+    def _render_until(self, text: str, end: int):
+        """
+        Show `text[:end]`: complete blocks are frozen in their own Markdown
+        and only the block still being written is sent again.
+        """
+        block_end = _find_block_end(text, self._block_start, end)
+        while block_end is not None:
+            self._tail.value = text[self._block_start:block_end]
+            self.scheduler.request_update(self._tail)
+            self._block_start = block_end
+            self._tail = self._new_block()
+            self.scheduler.request_update(self.message_column)
+            block_end = _find_block_end(text, self._block_start, end)
+
+        self._tail.value = text[self._block_start:end]
+        self.scheduler.request_update(self._tail)
+
+    def _show_document(self, full_text: str):
+        """
+        Show a long document without animation: chunks are created when scrolled
+        near them, so the first render does not depend on its length.
+        """
+        self._document = full_text
+        self._document_pos = 0
+        self._document_fence = None  # Opening line of a code block cut by the last chunk
+        self._pages = ListView(
+            height=self.page_height,
+            spacing=2,
+            on_scroll=self._on_document_scroll,
+            on_scroll_interval=100,
+        )
+        self.message_column.controls.append(self._pages)
+        self._append_chunks(3)
+
+    def _append_chunks(self, count: int):
+        """Append the next `count` chunks, cut at block boundaries, or at a line when a block is too long"""
+        text = self._document
+        for _ in range(count):
+            start = self._document_pos
+            if start >= len(text):
+                break
+            fence = self._document_fence
+            limit = min(start + self.chunk_size, len(text))
+            end = start
+            block_end = _find_block_end(text, end, limit, _FENCE.match(fence).group(1) if fence else None)
+            while block_end is not None:
+                end = block_end
+                block_end = _find_block_end(text, end, limit)
+
+            next_fence = None
+            if limit == len(text):
+                end = limit
+            elif end == start:
+                # No block ends within the chunk (long table, list, log or code block)
+                line_end = text.rfind("\n", start, limit)
+                if line_end == -1:
+                    line_end = text.find("\n", limit)
+                end = line_end + 1 if line_end != -1 else len(text)
+                if end < len(text):
+                    next_fence = _find_open_fence(text, start, end, fence)
+
+            value = text[start:end]
+            if fence:
+                value = fence + "\n" + value  # Reopen the code block cut by the last chunk
+            if next_fence:
+                value += _FENCE.match(next_fence).group(1)  # The next chunk reopens it
+            self._pages.controls.append(self._create_markdown(value))
+            self._document_pos = end
+            self._document_fence = next_fence
 
-        for ch in full_text:
-            partial_text += ch
-            md.value = partial_text
-            self.update()
-            await asyncio.sleep(1 / self.speed)
-        self.update()
+    def _on_document_scroll(self, e: OnScrollEvent):
+        if e.pixels >= e.max_scroll_extent - self.page_height and self._document_pos < len(self._document):
+            self._append_chunks(2)
+            self._pages.update()
+
+    async def _type_text(self, full_text: str):
+        self.message_column.controls.clear()
+        self.scheduler.request_update(self)
+
+        if len(full_text) > self.paginate_after:
+            self._show_document(full_text)
+            if self.pause > 0:
+                await self.scheduler.sleep(self.pause)
+            return
+
+        # Animación de aparición progresiva del markdown con soporte de links
+        self._block_start = 0
+        self._tail = self._new_block()
+
+        # Whole words are revealed from the elapsed time, once per frame
+        word_ends = [match.end() for match in _WORD.finditer(full_text)]
+        shown = 0
+        start = time.monotonic()
+        while shown < len(word_ends) and self.running:
+            await self.scheduler.sleep(1 / self.fps)
+            due = bisect.bisect_right(word_ends, (time.monotonic() - start) * self.speed)
+            if due > shown:
+                shown = due
+                self._render_until(full_text, word_ends[shown - 1])
+
+        if self.running:
+            self._render_until(full_text, len(full_text))
 
         if self.pause > 0:
-            await asyncio.sleep(self.pause)
+            await self.scheduler.sleep(self.pause)
+
+    def stream(self, source: AsyncIterable[str]):
+        """
+        Show an async iterator of text chunks as they arrive.
+        The bubble must be on the page.
+
+        Args:
+            source (AsyncIterable[str]): The text chunks.
+
+        Returns:
+            The asyncio future of the stream, resolved with the full text.
+        """
+        if self.completed is not None and not self.completed.done():
+            self.completed.cancel()  # The previous stream will not complete
+        self._source = source
+        self._stream_parts = []
+        self.completed = self.page.loop.create_future()
+        # A paused consumer of the previous stream wakes up and finds it replaced
+        self.page.loop.call_soon_threadsafe(self._wake_consumer)
+        self._consumer = self.scheduler.start(self._stream_text)
+        return self.completed
+
+    def _queue_chunk(self, chunk: str):
+        self._incoming.append(chunk)
+        self._incoming_size += len(chunk)
+        if not self._render_pending:
+            self._render_pending = True
+            self.scheduler.start(self._render_incoming)
+
+    def _wake_consumer(self):
+        if self._resume is not None and not self._resume.done():
+            self._resume.set_result(None)
+
+    async def _wait_mounted(self):
+        """Wait until the bubble is mounted again, without asking for more chunks"""
+        while not self.running:
+            self._resume = asyncio.get_running_loop().create_future()
+            await self._resume
+
+    async def _stream_text(self):
+        """
+        Consume `self._source`. There is one consumer per stream: while the
+        bubble is unmounted it stops asking for chunks, and the next mount
+        wakes it up.
+        """
+        source, completed = self._source, self.completed
+        self.message_column.controls.clear()
+        self.scheduler.request_update(self)
+
+        self._block_start = 0
+        self._tail = self._new_block()
+        self._stream_tail = ""  # Text of the block still open
+        self._incoming = []  # Chunks received but not shown yet
+        self._incoming_size = 0
+        self._render_pending = False
+        self._last_render = float("-inf")
+
+        # Chunks received by an earlier consumer (e.g. a cancelled one) are shown again
+        for chunk in self._stream_parts:
+            self._queue_chunk(chunk)
+
+        try:
+            async for chunk in source:
+                if source is not self._source:
+                    return  # Replaced by another stream
+                self._stream_parts.append(chunk)
+                self._queue_chunk(chunk)
+
+                # Backpressure: no more chunks are requested until the screen catches up
+                while self._incoming_size > self.max_pending or not self.running:
+                    await self._wait_mounted()
+                    if source is not self._source:
+                        return
+                    if self._incoming_size > self.max_pending:
+                        await self.scheduler.next_frame()
+        except Exception as error:
+            if source is self._source:
+                self._source = None
+            if not completed.done():
+                completed.set_exception(error)
+            return
+
+        while self._render_pending:
+            await self.scheduler.next_frame()
+        if source is not self._source:
+            return
+
+        # Stream complete: a new mount does not repeat it
+        full_text = "".join(self._stream_parts)
+        self.texts.append(full_text)
+        self._source = None
+        self._stream_parts = []
+        if not completed.done():
+            completed.set_result(full_text)
+
+    async def _render_incoming(self):
+        """Show everything received at once, at most `fps` times per second"""
+        await self.scheduler.sleep(self._last_render + 1 / self.fps - time.monotonic())
+
+        text = self._stream_tail + "".join(self._incoming)
+        self._incoming.clear()
+        self._incoming_size = 0
+        self._render_until(text, len(text))
+
+        # Frozen blocks are not touched again
+        self._stream_tail = text[self._block_start:]
+        self._block_start = 0
+        self._last_render = time.monotonic()
+        self._render_pending = False
 
     async def _type_loop(self):
         for text in self.texts:
@@ -0,0 +1,250 @@
+from typing import AsyncIterable, List, Optional, Union
+from flet import (
+    MarkdownExtensionSet,
+    MainAxisAlignment,
+    OnScrollEvent,
+    Container,
+    ListView,
+    Markdown,
+    Control,
+    Colors,
+    Row,
+)
+from .BubbleText import AnimatedTextBubble
+
+
+class _ChatMessage:
+    """A message kept on the server: only its text, plus its bubble while it is live."""
+    __slots__ = ("id", "text", "from_user", "bubble")
+
+    def __init__(self, id: int, text: Optional[str], from_user: bool):
+        self.id = id
+        self.text = text  # None until a streamed message completes
+        self.from_user = from_user
+        self.bubble: Optional[AnimatedTextBubble] = None
+
+
+class ChatView(ListView):
+    """
+    A scrolling chat container for Flet that only renders a window of messages.
+
+    Long conversations keep a bounded number of controls on the page: messages
+    are stored as plain text and turned into bubbles when they scroll into the
+    rendered window.
+
+    Features:
+        - Only the newest message animates (typed or streamed, see `AnimatedTextBubble`).
+        - Older messages are frozen into static Markdown bubbles.
+        - Messages outside the rendered window are dropped from the client and
+          rendered again when scrolling back to them.
+        - Optional limit of messages kept on the server.
+        - Sticks to the bottom while the user has not scrolled up.
+    """
+
+    def __init__(
+        self,
+        page_size: int = 20,
+        max_rendered: int = 60,
+        max_messages: Optional[int] = None,
+        speed: int = 200,
+        fps: int = 15,
+        bubble_color: Colors = Colors.GREY_900,
+        user_bubble_color: Colors = Colors.BLUE_GREY_800,
+        spacing: int = 10,
+        scroll_threshold: int = 50,
+        **kwargs,
+    ):
+        """
+        Initialize the ChatView widget.
+
+        Args:
+            page_size (int): Messages rendered at once when scrolling past an edge of the window (default=20).
+            max_rendered (int): Maximum messages kept on the client (default=60).
+            max_messages (int): Maximum messages kept on the server, oldest first out (default=None, unlimited).
+            speed (int): Typing speed of the newest message in characters per second (default=200).
+            fps (int): Maximum updates per second of the newest message (default=15).
+            bubble_color (Colors): Background color of the received messages.
+            user_bubble_color (Colors): Background color of the user messages.
+            spacing (int): Space between messages (default=10).
+            scroll_threshold (int): Distance in pixels from an edge that loads more messages (default=50).
+            **kwargs: Other `ListView` properties (expand, padding, ...).
+        """
+        super().__init__(spacing=spacing, on_scroll=self._on_scroll, on_scroll_interval=100, **kwargs)
+        self.page_size: int = page_size
+        self.max_rendered: int = max(max_rendered, page_size)
+        self.max_messages: Optional[int] = max_messages
+        self.speed: int = speed
+        self.fps: int = fps
+        self.bubble_color: Colors = bubble_color
+        self.user_bubble_color: Colors = user_bubble_color
+        self.scroll_threshold: int = scroll_threshold
+
+        self.messages: List[_ChatMessage] = []
+        self._next_id: int = 0
+        self._first: int = 0  # Rendered window: messages[_first:_last]
+        self._last: int = 0
+        self._at_bottom: bool = True
+        self._live: List[_ChatMessage] = []  # Messages that still have an animated bubble
+
+    # Messages
+    def add_message(
+        self,
+        text: Union[str, AsyncIterable[str]],
+        from_user: bool = False,
+    ) -> Optional[AnimatedTextBubble]:
+        """
+        Add a message at the end of the chat.
+
+        Args:
+            text (str | AsyncIterable[str]): Markdown text, or an async iterator of text chunks.
+            from_user (bool): If True, the message is shown at the right and does not animate.
+
+        Returns:
+            The animated bubble of the message, or None for user messages.
+        """
+        self._live = [m for m in self._live if not self._freeze(m)]
+
+        message = _ChatMessage(self._next_id, text if isinstance(text, str) else None, from_user)
+        self._next_id += 1
+        if not from_user:
+            message.bubble = AnimatedTextBubble(
+                text,
+                speed=self.speed,
+                fps=self.fps,
+                bgcolor=self.bubble_color,
+            )
+            self._live.append(message)
+        self.messages.append(message)
+
+        if self.max_messages is not None and len(self.messages) > self.max_messages:
+            self._drop_oldest(len(self.messages) - self.max_messages)
+
+        if self._last < len(self.messages) - 1:
+            # The user was reading an older window: jump back to the latest messages
+            self._first = self._last = len(self.messages) - 1
+            self.controls = []
+            self._at_bottom = True
+        self.controls.append(self._create_message_control(message))
+        self._last = len(self.messages)
+        if from_user:
+            self._at_bottom = True
+        if self._at_bottom:
+            self._trim_top()
+
+        if self.page:
+            self.update()
+            if self._at_bottom:
+                self.scroll_to(offset=-1, duration=0)
+        return message.bubble
+
+    def clear(self):
+        """Remove every message."""
+        self.messages.clear()
+        self._live.clear()
+        self.controls.clear()
+        self._first = self._last = 0
+        self._at_bottom = True
+        if self.page:
+            self.update()
+
+    def _freeze(self, message: _ChatMessage) -> bool:
+        """Replace the live bubble of a message with a static one once its text is known"""
+        bubble = message.bubble
+        if bubble is None:
+            return True
+        if message.text is None and not bubble.texts:
+            return False  # Still streaming: it keeps its live bubble
+        if message.text is None:
+            message.text = bubble.texts[-1]
+        message.bubble = None
+        index = message.id - self._first_id()
+        if self._first <= index < self._last:
+            self.controls[index - self._first] = self._create_message_control(message)
+        return True
+
+    def _drop_oldest(self, count: int):
+        for message in self.messages[:count]:
+            if message in self._live:
+                self._live.remove(message)
+        del self.messages[:count]
+        rendered = max(0, min(count, self._last) - self._first)
+        del self.controls[:rendered]
+        self._first = max(0, self._first - count)
+        self._last = max(self._first, self._last - count)
+
+    def _first_id(self) -> int:
+        return self.messages[0].id if self.messages else self._next_id
+
+    # Rendering
+    def _create_message_control(self, message: _ChatMessage) -> Control:
+        if message.bubble is not None:
+            bubble = message.bubble
+        else:
+            text = message.text
+            bubble = Container(
+                content=Markdown(
+                    value=text,
+                    selectable=True,
+                    extension_set=MarkdownExtensionSet.GITHUB_WEB,
+                    on_tap_link=lambda e: self.page.launch_url(e.data),
+                ),
+                bgcolor=self.user_bubble_color if message.from_user else self.bubble_color,
+                border_radius=20,
+                padding=10,
+                expand=True,
+                expand_loose=True,
+                on_long_press=lambda e: self.page.set_clipboard(text),
+            )
+        return Row(
+            controls=[bubble],
+            alignment=MainAxisAlignment.END if message.from_user else MainAxisAlignment.START,
+            key=str(message.id),  # Anchor to restore the scroll position
+        )
+
+    def _trim_top(self):
+        """Drop the oldest rendered messages beyond `max_rendered`"""
+        excess = (self._last - self._first) - self.max_rendered
+        if excess > 0:
+            del self.controls[:excess]
+            self._first += excess
+
+    def _trim_bottom(self):
+        """Drop the newest rendered messages beyond `max_rendered`, except a bubble still streaming"""
+        while self._last - self._first > self.max_rendered and self._freeze(self.messages[self._last - 1]):
+            self.controls.pop()
+            self._last -= 1
+
+    def _show_older(self):
+        anchor = self.controls[0].key
+        start = max(0, self._first - self.page_size)
+        self.controls[:0] = [self._create_message_control(m) for m in self.messages[start:self._first]]
+        self._first = start
+        self._trim_bottom()
+        self.update()
+        self.scroll_to(key=anchor, duration=0)
+
+    def _show_newer(self):
+        anchor = self.controls[-1].key if self.controls else None
+        end = min(len(self.messages), self._last + self.page_size)
+        self.controls.extend(self._create_message_control(m) for m in self.messages[self._last:end])
+        self._last = end
+        self._trim_top()
+        self.update()
+        if anchor is not None:
+            self.scroll_to(key=anchor, duration=0)
+
+    def _on_scroll(self, e: OnScrollEvent):
+        self._at_bottom = e.pixels >= e.max_scroll_extent - self.scroll_threshold
+        if e.pixels <= e.min_scroll_extent + self.scroll_threshold and self._first > 0:
+            self._show_older()
+        elif self._at_bottom and self._last < len(self.messages):
+            self._show_newer()
+
+    def scroll_to_bottom(self):
+        """Show the latest messages and scroll to the end."""
+        if self._last < len(self.messages):
+            self._first = self._last = max(0, len(self.messages) - self.page_size)
+            self.controls = []
+            self._show_newer()
+        self._at_bottom = True
+        self.scroll_to(offset=-1, duration=0)
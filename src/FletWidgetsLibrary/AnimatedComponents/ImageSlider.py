@@ -17,7 +17,7 @@ from flet import (
     Stack,
     Row,
 )
-import asyncio
+from .AnimationScheduler import AnimationScheduler
 
 class ImagesSlider(Container):
     def __init__(
@@ -98,7 +98,8 @@ class ImagesSlider(Container):
         self.set_current(0)
         self.is_running = True
         if self.auto_play:
-            self.auto_task = self.page.run_task(self._auto_switch)
+            self.scheduler = AnimationScheduler.get(self.page)
+            self.auto_task = self.scheduler.start(self._auto_switch)
 
     def will_unmount(self):
         """Se ejecuta al desmontar el control, detiene el autoplay."""
@@ -109,9 +110,13 @@ class ImagesSlider(Container):
         if not self.images:
             return
 
+        self._show_image(index)
+        self.update()
+
+    def _show_image(self, index: int):
+        """Apply the current image and indicators without sending them."""
         self.current_index = index % len(self.images)
         self.switcher.content = self.images[self.current_index]
-        self.switcher.update()
 
         for i, btn in enumerate(self.buttons):
             btn.bgcolor = (
@@ -120,7 +125,6 @@ class ImagesSlider(Container):
                 else self.buttons_color
             )
             btn.opacity = 1.0 if i == self.current_index else 0.4
-        self.update()
 
     def _on_next_click(self, e: ControlEvent):
         self.set_current(self.current_index + 1)
@@ -176,7 +180,8 @@ class ImagesSlider(Container):
     # --- Cambio automático ---
     async def _auto_switch(self):
         while self.is_running:
-            await asyncio.sleep(self.interval)
+            await self.scheduler.sleep(self.interval)
             if not self.page or not self.is_running:
                 break
-            self.set_current(self.current_index + 1)
\ No newline at end of file
+            self._show_image(self.current_index + 1)
+            self.scheduler.request_update(self)
\ No newline at end of file
@@ -13,8 +13,8 @@ from flet import (
     Row,
     app,
 )
-import asyncio
 from typing import Union
+from .AnimationScheduler import AnimationScheduler
 
 
 class HighlightRotatingText(Row):
@@ -120,7 +120,7 @@ class HighlightRotatingText(Row):
 
         # Adapt width dynamically
         self.animated_box.width = len(text) * self.width_factor
-        self.update()
+        self.scheduler.request_update(self)
 
         offset = self._get_offset()
         letters = [
@@ -137,21 +137,22 @@ class HighlightRotatingText(Row):
             for ch in text
         ]
         self.row.controls.extend(letters)
-        self.update()
+        self.scheduler.request_update(self)
+        await self.scheduler.next_frame()  # Letters must be on the page before they move
 
         # Animate letters one by one
         for letter in letters:
             letter.offset = (0, 0)
             letter.opacity = 1
-            self.update()
-            await asyncio.sleep(self.speed)
+            self.scheduler.request_update(letter)
+            await self.scheduler.sleep(self.speed)
 
     async def _rotate(self):
         """Rotate through phrases continuously (or until stopped)."""
         while self.running:
             phrase = self.phrases[self.index]
             await self._animate_text(phrase)
-            await asyncio.sleep(self.interval)
+            await self.scheduler.sleep(self.interval)
 
             self.index += 1
             if self.index >= len(self.phrases):
@@ -167,8 +168,9 @@ class HighlightRotatingText(Row):
     def start(self, e=None):
         """Start the rotation animation."""
         if not self.running:
+            self.scheduler = AnimationScheduler.get(self.page)
             self.running = True
-            self.page.run_task(self._rotate)
+            self.scheduler.start(self._rotate)
 
     def stop(self):
         """Stop the rotation animation."""
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Union, List
 from flet import (
     Container,
@@ -11,6 +10,7 @@ from flet import (
     alignment,
     TextOverflow
 )
+from .AnimationScheduler import AnimationScheduler
 
 
 class SplitText(Container):
@@ -26,6 +26,7 @@ class SplitText(Container):
         - Adjustable speed and pause duration.
         - Optional infinite looping.
         - Text customization: size, color, bold.
+        - Letter controls are reused across phrases and loops.
     """
 
     def __init__(
@@ -52,12 +53,15 @@ class SplitText(Container):
         self.bold: bool = bold
 
         self.row = Row(alignment="center", spacing=2)
+        self.letters: List[Text] = self.row.controls  # Pool of letters, as long as the longest text
+        self.animation: Animation = Animation(400, "easeOut")
         self.content: Control = self.row
         self.alignment = alignment.center
 
     def did_mount(self):
+        self.scheduler = AnimationScheduler.get(self.page)
         self.running = True
-        self.page.run_task(self._animate_loop)
+        self.scheduler.start(self._animate_loop)
 
     def will_unmount(self):
         self.running = False
@@ -76,39 +80,54 @@ class SplitText(Container):
             return (1, 0)
         return (0, 1)
 
-    async def _animate_text(self, text: str):
+    def _create_letter(self) -> Text:
+        return Text(
+            size=self.size,
+            color=self.color,
+            weight=FontWeight.BOLD if self.bold else None,
+            overflow=TextOverflow.ELLIPSIS
+        )
+
+    def _reset_letters(self, text: str):
         """
-        Animate a text by revealing each character with offset.
+        Bind the letter pool to a text: letters jump back to their initial
+        offset without animation, and the unused ones are hidden.
         """
-        self.row.controls.clear()
-        self.update()
+        longest = max(len(t) for t in self.texts)
+        while len(self.letters) < len(text):
+            self.letters.append(self._create_letter())
+        del self.letters[max(longest, len(text)):]
 
         offset = self._get_offset()
+        for i, letter in enumerate(self.letters):
+            letter.visible = i < len(text)
+            if letter.visible:
+                letter.value = text[i]
+                letter.animate_offset = None
+                letter.animate_opacity = None
+                letter.offset = offset
+                letter.opacity = 0
 
-        letters = [
-            Text(
-                value=ch,
-                size=self.size,
-                color=self.color,
-                weight=FontWeight.BOLD if self.bold else None,
-                offset=offset,
-                animate_offset=Animation(400, "easeOut"),
-                opacity=0,
-                animate_opacity=Animation(400, "easeOut"),
-                overflow=TextOverflow.ELLIPSIS
-            )
-            for ch in text
-        ]
-
-        self.row.controls.extend(letters)
-        self.update()
+    async def _animate_text(self, text: str):
+        """
+        Animate a text by revealing each character with offset.
+        """
+        self._reset_letters(text)
+        self.scheduler.request_update(self.row)
+        await self.scheduler.next_frame()  # Letters must be reset before they move again
+
+        letters = self.letters[:len(text)]
+        for letter in letters:
+            letter.animate_offset = self.animation
+            letter.animate_opacity = self.animation
+        self.scheduler.request_update(self.row)
 
         # Animate letters one by one
         for letter in letters:
             letter.offset = (0, 0)
             letter.opacity = 1
-            self.update()
-            await asyncio.sleep(self.speed)
+            self.scheduler.request_update(letter)
+            await self.scheduler.sleep(self.speed)
 
     async def _animate_loop(self):
         """
@@ -117,6 +136,6 @@ class SplitText(Container):
         while self.running:
             for text in self.texts:
                 await self._animate_text(text)
-                await asyncio.sleep(self.pause)
+                await self.scheduler.sleep(self.pause)
             if not self.loop:
                 break
\ No newline at end of file
@@ -4,7 +4,7 @@ from flet import (
     Colors,
     Text
 )
-import asyncio
+from .AnimationScheduler import AnimationScheduler
 
 
 class TextFader(Container):
@@ -58,10 +58,11 @@ class TextFader(Container):
     def did_mount(self):
         """
         Called when the widget is mounted to the page.
-        Starts the fade animation loop.
+        Starts the fade animation loop on the page's animation clock.
         """
+        self.scheduler = AnimationScheduler.get(self.page)
         self.running = True
-        self.page.run_task(self._fade_loop)
+        self.scheduler.start(self._fade_loop)
 
     def will_unmount(self):
         """
@@ -77,8 +78,8 @@ class TextFader(Container):
         try:
             while self.opacity < 1.0 and self.running:
                 self.opacity += 0.05
-                self.update()
-                await asyncio.sleep(self.speed)
+                self.scheduler.request_update(self)
+                await self.scheduler.sleep(self.speed)
         except AssertionError as e:
             return e
 
@@ -89,8 +90,8 @@ class TextFader(Container):
         try:
             while self.opacity > 0.0 and self.running:
                 self.opacity -= 0.05
-                self.update()
-                await asyncio.sleep(self.speed)
+                self.scheduler.request_update(self)
+                await self.scheduler.sleep(self.speed)
         except AssertionError as e:
             return e
 
@@ -101,10 +102,10 @@ class TextFader(Container):
         """
         while self.running:
             await self._fade_in()
-            await asyncio.sleep(self.pause)
+            await self.scheduler.sleep(self.pause)
             if not self.permanent:
                 await self._fade_out()
             if self.loop:
-                await asyncio.sleep(self.pause)
+                await self.scheduler.sleep(self.pause)
             else:
                 break
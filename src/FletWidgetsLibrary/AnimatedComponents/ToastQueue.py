@@ -0,0 +1,135 @@
+from typing import Deque, Optional, Tuple
+from collections import deque
+from flet import (
+    SnackBar,
+    Colors,
+    Page,
+    Text,
+)
+from .AnimationScheduler import AnimationScheduler
+import threading
+import weakref
+
+
+class ToastQueue:
+    """
+    A per-page queue of short notifications for Flet.
+
+    Every toast of a page is shown, one at a time, in the same SnackBar, so
+    `page.overlay` does not grow no matter how many notifications are sent.
+
+    Features:
+        - One queue and one SnackBar per page (see `ToastQueue.get`).
+        - Repeated toasts are ignored while they are shown or waiting.
+        - Bounded number of waiting toasts: the oldest is dropped first.
+        - Only weak references to the page and its SnackBar are kept.
+        - `show` can be called from any thread (e.g. sync event handlers).
+    """
+
+    _queues: "weakref.WeakKeyDictionary[Page, ToastQueue]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, page: Page, max_pending: int = 5, duration: int = 3000):
+        """
+        Initialize the queue (prefer `ToastQueue.get(page)`).
+
+        Args:
+            page (Page): The page where the toasts are shown.
+            max_pending (int): Maximum toasts waiting to be shown (default=5).
+            duration (int): Time each toast is shown, in milliseconds (default=3000).
+        """
+        self._page_ref: "weakref.ref[Page]" = weakref.ref(page)
+        self.max_pending: int = max_pending
+        self.duration: int = duration
+        self._pending: Deque[Tuple[str, Optional[Colors]]] = deque()
+        self._current: Optional[Tuple[str, Optional[Colors]]] = None
+        self._draining: bool = False
+        self._lock = threading.Lock()  # `show` may run on a worker thread while `_drain` runs on the loop
+        # The SnackBar belongs to the page overlay; the queue only points to it
+        self._snack_bar_ref: Optional["weakref.ref[SnackBar]"] = None
+
+    @property
+    def page(self) -> Optional[Page]:
+        """The page of the queue, or None once it has been freed."""
+        return self._page_ref()
+
+    @classmethod
+    def get(cls, page: Page) -> "ToastQueue":
+        """
+        Return the toast queue of a page, creating it on first use.
+
+        Args:
+            page (Page): The page.
+        """
+        queue = cls._queues.get(page)
+        if queue is None:
+            queue = cls._queues[page] = cls(page)
+        return queue
+
+    def show(self, message: str, bgcolor: Colors = None):
+        """
+        Queue a toast.
+
+        Args:
+            message (str): Text of the toast.
+            bgcolor (Colors): Background color of the toast (default=None, theme color).
+        """
+        toast = (message, bgcolor)
+        with self._lock:
+            if toast == self._current or toast in self._pending:
+                return
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+            self._pending.append(toast)
+            if self._draining:
+                return
+            self._draining = True
+        AnimationScheduler.get(self.page).start(self._drain)
+
+    def _get_snack_bar(self, page: Page) -> SnackBar:
+        """Return the shared SnackBar, adding it to the page overlay if needed."""
+        snack_bar = self._snack_bar_ref() if self._snack_bar_ref else None
+        if snack_bar is None or snack_bar not in page.overlay:
+            snack_bar = SnackBar(
+                content=Text(color=Colors.WHITE),
+                action="Close",
+                action_color=Colors.WHITE,
+                duration=self.duration,
+            )
+            self._snack_bar_ref = weakref.ref(snack_bar)
+            page.overlay.append(snack_bar)
+            page.update()
+        return snack_bar
+
+    async def _drain(self):
+        """Show the waiting toasts one after another in the shared SnackBar."""
+        try:
+            while True:
+                page = self.page
+                with self._lock:
+                    # Checked together with `show`, so no toast is left behind
+                    if page is None or not self._pending:
+                        self._current = None
+                        self._draining = False
+                        return
+                    self._current = self._pending.popleft()
+                    message, bgcolor = self._current
+                scheduler = AnimationScheduler.get(page)
+                snack_bar = self._get_snack_bar(page)
+                del page  # The queue must not keep the page alive while it waits
+
+                if snack_bar.open:
+                    # Close it first so the client shows the next toast again
+                    snack_bar.open = False
+                    snack_bar.update()
+
+                snack_bar.content.value = message
+                snack_bar.bgcolor = bgcolor
+                snack_bar.open = True
+                snack_bar.update()
+                del snack_bar
+                await scheduler.sleep(self.duration / 1000)
+        except BaseException:
+            with self._lock:
+                self._current = None
+                self._draining = False
+            raise
@@ -3,11 +3,13 @@ from flet import (
     TextOverflow,
     FontWeight,
     Container,
+    TextSpan,
     Control,
     Colors,
     Text
 )
-import asyncio
+from .AnimationScheduler import AnimationScheduler
+import time
 
 
 class TypeWriter(Container):
@@ -21,6 +23,8 @@ class TypeWriter(Container):
         - Animate text letter by letter.
         - Support for single or multiple texts.
         - Adjustable typing speed and pause duration.
+        - Time-based progress: at most one update per frame, without drift.
+        - Append-only rendering: each update only carries the new characters.
         - Optional infinite looping.
         - Text customization: size, color, bold.
     """
@@ -33,7 +37,9 @@ class TypeWriter(Container):
         loop: bool = False,
         size: int = 24,
         color: Colors = Colors.WHITE,
-        bold: bool = False
+        bold: bool = False,
+        fps: int = 30,
+        append_only: bool = True
     ):
         """
         Initialize the TypeWriter widget.
@@ -46,11 +52,16 @@ class TypeWriter(Container):
             size (int): Font size of the text (default=24).
             color (Colors): Text color (default=Colors.WHITE).
             bold (bool): Whether the text is bold (default=False).
+            fps (int): Maximum updates per second while typing (default=30).
+            append_only (bool): If True, new characters are appended as text spans
+                instead of re-sending the whole text on every update (default=True).
         """
         super().__init__()
         self.texts: Union[str, List[str]] = texts if isinstance(texts, list) else [texts]
         self.speed: float = speed
         self.pause: float = pause
+        self.fps: int = fps
+        self.append_only: bool = append_only
         self.value: str = ""
         self.content: Control = Text(
             value=self.value,
@@ -68,10 +79,11 @@ class TypeWriter(Container):
     def did_mount(self):
         """
         Called when the widget is mounted to the page.
-        Starts the typing animation loop.
+        Starts the typing animation loop on the page's animation clock.
         """
+        self.scheduler = AnimationScheduler.get(self.page)
         self.running = True
-        self.page.run_task(self._type_loop)
+        self.scheduler.start(self._type_loop)
 
     def will_unmount(self):
         """
@@ -82,20 +94,29 @@ class TypeWriter(Container):
 
     async def _type_text(self, text: str):
         """
-        Animate typing a single text string character by character.
+        Animate typing a single text string.
+        The visible length follows the elapsed time, so each frame reveals
+        every character that is due instead of one character per update.
 
         Args:
             text (str): The text to animate.
         """
         self.value = ""
         self.content.value = self.value
-        self.update()
+        self.content.spans = []
+        self.scheduler.request_update(self.content)
 
-        for letter in text:
-            self.value += letter
-            self.content.value = self.value
-            self.update()
-            await asyncio.sleep(1 / self.speed)
+        start = time.monotonic()
+        while len(self.value) < len(text) and self.running:
+            await self.scheduler.sleep(1 / self.fps)
+            visible = min(len(text), int((time.monotonic() - start) * self.speed))
+            if visible > len(self.value):
+                if self.append_only:
+                    self.content.spans.append(TextSpan(text[len(self.value):visible]))
+                else:
+                    self.content.value = text[:visible]
+                self.value = text[:visible]
+                self.scheduler.request_update(self.content)
 
     async def _type_loop(self):
         """
@@ -105,6 +126,6 @@ class TypeWriter(Container):
         while self.running:
             for text in self.texts:
                 await self._type_text(text)
-                await asyncio.sleep(self.pause)
+                await self.scheduler.sleep(self.pause)
             if not self.loop:  # Exit if looping is disabled
                 break
@@ -1,6 +1,9 @@
+from .AnimationScheduler import AnimationScheduler
+from .ToastQueue import ToastQueue
 from .AnimatedLists import ListItem, OrdenedList, UnorderedList
 from .RotatingText import HighlightRotatingText
 from .BubbleText import AnimatedTextBubble
+from .ChatView import ChatView
 from .ImageSlider import ImagesSlider
 from .TypeWriter import TypeWriter
 from .CircleCard import CircleCard
@@ -11,11 +14,14 @@ __all__ = [
     "TextFader",
     "TypeWriter",
     "AnimatedTextBubble",
+    "ChatView",
     "SplitText",
     "HighlightRotatingText",
     "ImagesSlider",
     "ListItem", 
     "OrdenedList", 
     "UnorderedList",
-    "CircleCard"
+    "CircleCard",
+    "AnimationScheduler",
+    "ToastQueue"
 ]
\ No newline at end of file
@@ -0,0 +1,345 @@
+from typing import List, Any, Optional, Callable, Dict
+import math
+from flet import (
+    OnScrollEvent,
+    TextOverflow,
+    ScrollMode,
+    FontWeight,
+    Alignment,
+    Container,
+    alignment,
+    Checkbox,
+    padding,
+    Column,
+    Colors,
+    Icons,
+    Icon,
+    Text,
+    Row,
+)
+from .TreeView import TreeView, TreeNode, TreeViewConfig, _transaction
+
+class TreeGridColumn:
+    """A declared column of a TreeGrid; the first column holds the tree itself"""
+    def __init__(
+        self,
+        name: str,
+        title: str = None,
+        width: int = 120,
+        field: str = None,  # metadata field
+        aggregate: str = None,  # name of a TreeAggregate of the grid
+        value: Optional[Callable[[TreeNode], Any]] = None,
+        format: Optional[Callable[[Any], str]] = None,
+        sortable: bool = True,
+        align: Alignment = alignment.center_left,
+    ):
+        self.name = name
+        self.title = title if title is not None else name
+        self.width = width
+        self.field = field
+        self.aggregate = aggregate
+        self.value = value
+        self.format = format or str
+        self.sortable = sortable
+        self.align = align
+    
+    def get_value(self, node: TreeNode) -> Any:
+        if self.value:
+            return self.value(node)
+        if self.field:
+            return node.metadata.get(self.field)
+        if self.aggregate:
+            return node._aggregates.get(self.aggregate)
+        return getattr(node, self.name, None)
+    
+    def format_value(self, value: Any) -> str:
+        return "" if value is None else self.format(value)
+
+class _ColumnSortKey:
+    """Sort value of a cell: empty cells last, optionally descending"""
+    __slots__ = ("value", "descending")
+    
+    def __init__(self, value: Any, descending: bool):
+        self.value = value
+        self.descending = descending
+    
+    def __eq__(self, other: '_ColumnSortKey') -> bool:
+        return self.value == other.value
+    
+    def __lt__(self, other: '_ColumnSortKey') -> bool:
+        if self.value is None or other.value is None:
+            return self.value is not None and other.value is None
+        if self.descending:
+            return other.value < self.value
+        return self.value < other.value
+
+class TreeGrid(TreeView):
+    """Multi-column TreeView that only renders the rows inside the viewport"""
+    def __init__(
+        self,
+        nodes: List[TreeNode] = None,
+        columns: List[TreeGridColumn] = None,
+        config: TreeViewConfig = None,
+        viewport_height: int = 400,
+        overscan: int = 5,
+        header_height: int = 36,
+        **kwargs,  # TreeView callbacks and options
+    ):
+        self.columns = columns or [TreeGridColumn("name", "Name", width=240)]
+        self.viewport_height = viewport_height
+        self.overscan = overscan
+        self.header_height = header_height
+        self._scroll_offset = 0
+        self._first_row = 0
+        self._sort_column = None
+        self._sort_descending = False
+        super().__init__(nodes=nodes, config=config, **kwargs)
+        self.spacing = 0
+    
+    # Rendering
+    def build_tree(self):
+        """Create the header and a fixed pool of row controls, recycled while scrolling"""
+        self._sort_icons: Dict[str, Icon] = {}
+        header = Row(
+            controls=[self._create_header_cell(column) for column in self.columns],
+            spacing=0,
+            height=self.header_height,
+        )
+        
+        pool_size = math.ceil(self.viewport_height / self.config.node_height) + 2 * self.overscan
+        self._row_pool = [self._create_row() for _ in range(pool_size)]
+        self._top_spacer = Container(height=0)
+        self._bottom_spacer = Container(height=0)
+        self._body = Column(
+            controls=[self._top_spacer, *self._row_pool, self._bottom_spacer],
+            spacing=0,
+            height=self.viewport_height,
+            scroll=ScrollMode.AUTO,
+            on_scroll=self._on_scroll,
+            on_scroll_interval=50,
+        )
+        self.controls = [header, self._body]
+        
+        self._rebuild_visible_rows()
+        self._render_window()
+    
+    def _create_header_cell(self, column: TreeGridColumn) -> Container:
+        sort_icon = Icon(Icons.ARROW_UPWARD, size=14, visible=False)
+        self._sort_icons[column.name] = sort_icon
+        return Container(
+            content=Row(
+                controls=[Text(column.title, weight=FontWeight.BOLD, no_wrap=True), sort_icon],
+                spacing=4,
+                tight=True,
+            ),
+            width=column.width,
+            alignment=column.align,
+            padding=padding.symmetric(horizontal=8),
+            on_click=(lambda e, c=column: self._on_header_click(c)) if column.sortable else None,
+        )
+    
+    def _create_row(self) -> Container:
+        """Create an unbound row; its controls are reused for whichever node scrolls into it"""
+        tree_column, cell_columns = self.columns[0], self.columns[1:]
+        
+        indent = Container(width=0)
+        expand_icon = Icon(Icons.REMOVE, size=16, visible=self.config.show_expand_icons)
+        checkbox = Checkbox(tristate=True, visible=self.config.show_checkboxes)
+        node_icon = Icon(Icons.INSERT_DRIVE_FILE, size=20, visible=self.config.show_icons)
+        name_text = Text(size=14, no_wrap=True, overflow=TextOverflow.ELLIPSIS)
+        
+        cell_texts = [Text(size=14, no_wrap=True, overflow=TextOverflow.ELLIPSIS) for _ in cell_columns]
+        cells = [
+            Container(
+                content=Row([indent, expand_icon, checkbox, node_icon, name_text], spacing=8, tight=True),
+                width=tree_column.width,
+                alignment=tree_column.align,
+                padding=padding.symmetric(horizontal=8),
+            )
+        ]
+        for column, text in zip(cell_columns, cell_texts):
+            cells.append(Container(
+                content=text,
+                width=column.width,
+                alignment=column.align,
+                padding=padding.symmetric(horizontal=8),
+            ))
+        
+        row = Container(
+            content=Row(controls=cells, spacing=0),
+            height=self.config.node_height,
+            bgcolor=Colors.TRANSPARENT,
+            visible=False,
+        )
+        row.on_click = lambda e, r=row: r.data and self.on_node_click(e, r.data)
+        row.on_long_press = lambda e, r=row: r.data and self.on_node_long_press(e, r.data)
+        checkbox.on_change = lambda e, r=row: r.data and self.toggle_checked(r.data)
+        
+        # Save references so the row can be re-bound
+        row._indent = indent
+        row._expand_icon = expand_icon
+        row._checkbox = checkbox
+        row._node_icon = node_icon
+        row._name_text = name_text
+        row._cell_texts = cell_texts
+        row._signature = None
+        return row
+    
+    def _get_row_signature(self, node: TreeNode, level: int) -> tuple:
+        """Everything a row displays; rows whose signature did not change are not re-sent"""
+        return (
+            node,
+            level,
+            node.expanded,
+            node.has_children,
+            node in self._selection,
+            self.get_check_state(node) if self.config.show_checkboxes else None,
+            self.get_node_icon(node),
+            tuple(column.format_value(column.get_value(node)) for column in self.columns),
+        )
+    
+    def _bind_row(self, row: Container, signature: tuple):
+        node, level, expanded, has_children, selected, check_state, icon, values = signature
+        row.data = node
+        row.visible = True
+        row._indent.width = level * self.config.indent_size
+        if has_children:
+            row._expand_icon.name = Icons.KEYBOARD_ARROW_DOWN if expanded else Icons.KEYBOARD_ARROW_RIGHT
+            row._expand_icon.opacity = 1
+        else:
+            row._expand_icon.name = Icons.REMOVE
+            row._expand_icon.opacity = 0.3
+        row._checkbox.value = check_state
+        row._node_icon.name = icon
+        row._name_text.value = values[0]
+        for text, value in zip(row._cell_texts, values[1:]):
+            text.value = value
+        
+        # Same selection style as the TreeView rows
+        row.bgcolor = self.config.selection_color if selected else Colors.TRANSPARENT
+        row._name_text.weight = FontWeight.BOLD if selected else FontWeight.NORMAL
+        row._name_text.color = self.config.selection_text_color if selected else None
+    
+    def _render_window(self):
+        """Bind the row pool to the visible rows around the scroll offset"""
+        rows, pool = self._visible_rows, self._row_pool
+        height = self.config.node_height
+        
+        # The window only shifts once the viewport leaves its overscan margin
+        first_in_view = int(self._scroll_offset // height)
+        last_in_view = first_in_view + math.ceil(self.viewport_height / height)
+        first = self._first_row
+        if first_in_view < first or last_in_view > first + len(pool):
+            first = first_in_view - self.overscan
+        first = max(0, min(first, len(rows) - len(pool)))
+        self._first_row = first
+        count = min(len(pool), len(rows) - first)
+        
+        top, bottom = first * height, (len(rows) - first - count) * height
+        if self._top_spacer.height != top or self._bottom_spacer.height != bottom:
+            self._top_spacer.height = top
+            self._bottom_spacer.height = bottom
+            self._mark_dirty(self._top_spacer, self._bottom_spacer)
+        
+        for i, row in enumerate(pool):
+            if i < count:
+                signature = self._get_row_signature(rows[first + i], self._row_levels[first + i])
+                if signature != row._signature:
+                    self._bind_row(row, signature)
+                    row._signature = signature
+                    self._mark_dirty(row)
+            elif row.visible:
+                row.data = None
+                row.visible = False
+                row._signature = None
+                self._mark_dirty(row)
+    
+    def _flush(self):
+        # Every transaction ends by re-binding the rows in view
+        if not self._batch_depth and hasattr(self, '_row_pool'):
+            self._render_window()
+        super()._flush()
+    
+    def _on_scroll(self, e: OnScrollEvent):
+        with self.batch_update():
+            self._scroll_offset = e.pixels
+    
+    # Rows are rendered from the visible row list, not as per-node widgets
+    def _insert_node_widget(self, parent: Optional[TreeNode], node: TreeNode, position: int):
+        pass
+    
+    def _remove_node_widget(self, parent: Optional[TreeNode], index: int):
+        pass
+    
+    def _replace_node_widget(self, node: TreeNode):
+        pass
+    
+    def _move_node_widget(self, parent: Optional[TreeNode], node: TreeNode, old_index: int, new_index: int):
+        pass
+    
+    def get_node_level(self, node: TreeNode) -> int:
+        position = self._get_row_position(node)
+        if position is None:
+            return super().get_node_level(node)
+        return self._row_levels[position]
+    
+    # Scrolling
+    def scroll_to_node(self, node: TreeNode):
+        """Scroll the minimum needed to bring a visible node into the viewport"""
+        position = self._get_row_position(node)
+        if position is None:
+            return
+        
+        top = position * self.config.node_height
+        bottom = top + self.config.node_height
+        if top < self._scroll_offset:
+            offset = top
+        elif bottom > self._scroll_offset + self.viewport_height:
+            offset = bottom - self.viewport_height
+        else:
+            return
+        
+        with self.batch_update():
+            self._scroll_offset = offset
+            if self._body.page:
+                self._body.scroll_to(offset=offset, duration=0)
+    
+    def _focus_row(self, node: TreeNode, extend: bool = False):
+        super()._focus_row(node, extend)
+        self.scroll_to_node(node)
+    
+    # Column sort
+    def _on_header_click(self, column: TreeGridColumn):
+        descending = column.name == self._sort_column and not self._sort_descending
+        self.sort_by(column.name, descending)
+    
+    @_transaction
+    def sort_by(self, column_name: str, descending: bool = False):
+        """Sort the siblings of every level by a column (folders stay first)"""
+        column = next(c for c in self.columns if c.name == column_name)
+        self.sort_key = lambda node: (
+            0 if node.has_children else 1,
+            _ColumnSortKey(column.get_value(node), descending)
+        )
+        self._sort_column, self._sort_descending = column.name, descending
+        
+        self._root_keys = self._sort_siblings(self.nodes)
+        for node in self.nodes:
+            self._sort_subtree(node)
+        self._rebuild_visible_rows()
+        
+        for name, sort_icon in self._sort_icons.items():
+            sort_icon.visible = name == column.name
+            sort_icon.name = Icons.ARROW_DOWNWARD if descending else Icons.ARROW_UPWARD
+            self._mark_dirty(sort_icon)
+    
+    @_transaction
+    def update_metadata(self, node: TreeNode, **values):
+        """Change metadata fields, moving the rows whose sorted value changed"""
+        super().update_metadata(node, **values)
+        
+        # Aggregate columns also change on the ancestors
+        current = node
+        while self.sort_key and current is not None:
+            self._reposition_node(current)
+            current = current.parent
@@ -1,13 +1,22 @@
 from typing import List, Any, Optional, Callable, Dict, Union
+from contextlib import contextmanager
+from functools import partial, wraps
+from collections import deque
+from bisect import bisect_right
+import threading
+import asyncio
+import re
 from flet import (
     MainAxisAlignment,
     PopupMenuPosition,
     PopupMenuButton,
     AnimationCurve,
     PopupMenuItem,
+    KeyboardEvent,
     ControlEvent,
     AlertDialog,
     BottomSheet,
+    Checkbox,
     TextButton,
     FontWeight,
     IconValue,
@@ -23,6 +32,14 @@ from flet import (
     Row,
 )
 
+def _transaction(method):
+    """Runs a TreeView method under its lock and sends its changes in one flush"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.batch_update():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class TreeNode:
     def __init__(
         self, 
@@ -37,7 +54,9 @@ class TreeNode:
         metadata: Dict[str, Any] = None,
         selectable: bool = True,
         draggable: bool = False,
-        droppable: bool = False
+        droppable: bool = False,
+        checked: bool = False,
+        status: Dict[str, Any] = None
     ):
         self.id = id or name  # Use name as ID if id not provided
         self.name = name
@@ -51,6 +70,9 @@ class TreeNode:
         self.selectable = selectable
         self.draggable = draggable
         self.droppable = droppable
+        self.checked = checked
+        self.status = status or {}  # Live status badges (build, health, ...)
+        self.version = 0  # Bumped on every change, invalidates the cached rendering
         self.parent = None
         
         # Set parent for each child
@@ -59,6 +81,113 @@ class TreeNode:
 
     def change_icon(self, new_icon: IconValue) -> None:
         self.icon = new_icon
+        self.touch()
+    
+    def touch(self) -> None:
+        """Mark the node as changed (call it after editing its fields directly)"""
+        self.version += 1
+    
+    @property
+    def has_children(self) -> bool:
+        return bool(self.children)
+    
+    @property
+    def loaded_children(self) -> List['TreeNode']:
+        """Children already in memory (all of them, except for shared models)"""
+        return self.children
+
+class TreeAggregate:
+    """A subtree total (sum of each node's own value) kept up to date by TreeView"""
+    def __init__(
+        self,
+        name: str,
+        field: str = None,
+        kind: str = "sum",  # "sum" of metadata[field], or "count" of nodes
+        value: Optional[Callable[[TreeNode], float]] = None,
+        format: Optional[Callable[[float], str]] = None,
+        show_badge: bool = True,
+    ):
+        if kind not in ("sum", "count"):
+            raise ValueError(f"Unsupported aggregate kind: {kind}")
+        self.name = name
+        self.field = field
+        self.kind = kind
+        self.value = value
+        self.format = format or (lambda v: str(int(v)) if float(v).is_integer() else f"{v:.2f}")
+        self.show_badge = show_badge
+    
+    def get_value(self, node: TreeNode) -> float:
+        """Own contribution of a node, without its descendants"""
+        if self.value:
+            return self.value(node)
+        if self.kind == "count":
+            # Without a field, count the leaves (files)
+            if self.field is None:
+                return 0 if node.children else 1
+            return 1 if node.metadata.get(self.field) else 0
+        return node.metadata.get(self.field, 0) or 0
+
+class SharedTreeModel:
+    """An immutable TreeNode forest shared by the TreeViews of every session"""
+    def __init__(self, nodes: List[TreeNode], aggregates: List[TreeAggregate] = None):
+        self.nodes = nodes
+        self.aggregates = aggregates or []
+        
+        # Id lookup and subtree totals are computed once for all sessions
+        self._nodes_by_id: Dict[str, TreeNode] = {}
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            self._nodes_by_id.setdefault(node.id, node)
+            stack.extend(node.children)
+        for node in nodes:
+            self._init_aggregates(node)
+    
+    def _init_aggregates(self, node: TreeNode) -> Dict[str, float]:
+        node._aggregates = {aggregate.name: aggregate.get_value(node) for aggregate in self.aggregates}
+        for child in node.children:
+            for name, value in self._init_aggregates(child).items():
+                node._aggregates[name] += value
+        return node._aggregates
+    
+    def find_node_by_id(self, node_id: str) -> Optional[TreeNode]:
+        return self._nodes_by_id.get(node_id)
+
+class _SessionNode(TreeNode):
+    """Per-session overlay of a shared node: view state lives here, model fields are read from the source"""
+    _shared_fields = {"id", "name", "data", "icon", "tags", "metadata", "selectable", "draggable", "droppable"}
+    
+    def __init__(self, source: TreeNode, parent: Optional['_SessionNode'], tree_view: 'TreeView'):
+        self.source = source
+        self.parent = parent
+        self.expanded = source.expanded
+        self.checked = False
+        self.content = None  # Controls can't be shared between pages
+        self.status = dict(source.status)
+        self.version = 0
+        self._aggregates = source._aggregates
+        self._children = None
+        self._tree_view = tree_view
+    
+    def __getattr__(self, name: str) -> Any:
+        if name in _SessionNode._shared_fields:
+            return getattr(self.source, name)
+        raise AttributeError(name)
+    
+    @property
+    def children(self) -> List[TreeNode]:
+        # Loaded on first access (expanding, searching, ...)
+        if self._children is None:
+            self._children = self._tree_view._load_children(self)
+        return self._children
+    
+    @property
+    def has_children(self) -> bool:
+        return bool(self.source.children)
+    
+    @property
+    def loaded_children(self) -> List[TreeNode]:
+        return self._children or []
 
 class TreeViewConfig:
     def __init__(
@@ -77,6 +206,14 @@ class TreeViewConfig:
         hover_color: str = Colors.TRANSPARENT,
         custom_icons: Dict[str, IconValue] = None,
         node_height: int = 32,
+        page_size: Optional[int] = None,
+        keyboard_page_step: int = 10,
+        show_checkboxes: bool = False,
+        status_fps: int = 30,
+        mutation_rate: int = 10,
+        mutation_batch_size: int = 500,
+        history_limit: int = 100,
+        history_max_operations: int = 10000,
     ):
         self.default_folder_icon = default_folder_icon
         self.default_file_icon = default_file_icon
@@ -92,6 +229,14 @@ class TreeViewConfig:
         self.hover_color = hover_color
         self.custom_icons = custom_icons or {}
         self.node_height = node_height
+        self.page_size = page_size  # Children rendered per "show more" chunk (None = all)
+        self.keyboard_page_step = keyboard_page_step  # Rows moved by PageUp/PageDown
+        self.show_checkboxes = show_checkboxes  # Tri-state checkboxes propagated through the tree
+        self.status_fps = status_fps  # Max status feed flushes per second
+        self.mutation_rate = mutation_rate  # Queued mutation batches applied per second
+        self.mutation_batch_size = mutation_batch_size  # Max queued mutations per batch
+        self.history_limit = history_limit  # Undo steps kept (0 disables the history)
+        self.history_max_operations = history_max_operations  # Inverse operations kept across all steps
 
 class TreeView(Column):
     def __init__(
@@ -102,6 +247,7 @@ class TreeView(Column):
         on_node_select: Optional[Callable[[TreeNode], None]] = None,
         on_node_expand: Optional[Callable[[TreeNode], None]] = None,
         on_node_collapse: Optional[Callable[[TreeNode], None]] = None,
+        on_node_check: Optional[Callable[[TreeNode, bool], None]] = None,
         # Context callbacks
         on_rename: Optional[Callable[[TreeNode, str], bool]] = None,
         on_delete: Optional[Callable[[TreeNode], bool]] = None,
@@ -115,13 +261,23 @@ class TreeView(Column):
         # Customizing the context menu
         context_menu_items: List[Dict[str, Any]] = None,
         custom_node_renderer: Optional[Callable[[TreeNode, 'TreeView'], Any]] = None,
+        # Keeps siblings ordered by this key (e.g. TreeView.natural_sort_key)
+        sort_key: Optional[Callable[[TreeNode], Any]] = None,
+        # Subtree totals shown as badges next to folder names
+        aggregates: List[TreeAggregate] = None,
+        # Text shown by each status badge
+        status_formatter: Optional[Callable[[str, Any], str]] = None,
+        # Read-only model shared with other sessions (replaces `nodes`)
+        shared_model: Optional[SharedTreeModel] = None,
     ):
         super().__init__()
+        self.shared_model = shared_model
         self.nodes = nodes or []
         self.config = config or TreeViewConfig()
         self.on_node_select = on_node_select
         self.on_node_expand = on_node_expand
         self.on_node_collapse = on_node_collapse
+        self.on_node_check = on_node_check
         self.on_rename = on_rename
         self.on_delete = on_delete
         self.on_properties = on_properties
@@ -131,12 +287,75 @@ class TreeView(Column):
         self.on_double_click = on_double_click
         self.on_right_click = on_right_click
         self.custom_node_renderer = custom_node_renderer
+        self.sort_key = sort_key
+        self.aggregates = aggregates or []
+        self.status_formatter = status_formatter or (lambda field, value: str(value))
         self.context_menu_items = context_menu_items or self._get_default_context_menu_items()
         
-        self.selected_nodes = [] if self.config.multi_select else None
+        # Ordered set of selected nodes (dict keys keep insertion order)
+        self._selection: Dict[TreeNode, None] = {}
+        self._anchor_node = None  # Start of shift-range selections
+        self._focus_node = None  # Row driven by keyboard navigation
         self.selected_node = None
         self.hovered_node = None
         
+        # Controls waiting to be sent in the next batched flush
+        self._dirty_controls: Dict[int, Any] = {}
+        self._batch_depth = 0
+        self._lock = threading.RLock()
+        
+        # Mutations queued from other threads, drained in batches
+        self._mutation_queue = deque()
+        self._queue_lock = threading.Lock()
+        self._drain_scheduled = False
+        
+        # Undo/redo steps: lists of (undo operation, redo operation) pairs
+        self._undo_stack = deque()
+        self._redo_stack = []
+        self._history_operations = 0
+        self._pending_step = []
+        self._replaying = False
+        
+        # Shared models only get session nodes for what this session loads
+        if shared_model is not None:
+            if self.config.show_checkboxes:
+                raise ValueError("Checkboxes are not supported with a shared model")
+            self.aggregates = shared_model.aggregates
+            self.nodes = [_SessionNode(node, None, self) for node in shared_model.nodes]
+        
+        # Id lookup for the whole model (first node wins on duplicated ids)
+        self._nodes_by_id: Dict[str, TreeNode] = {}
+        for node in self.nodes:
+            self._index_subtree(node)
+        
+        # Checked-leaf counters per node for the checkbox mode
+        if self.config.show_checkboxes:
+            for node in self.nodes:
+                self._init_check_counts(node)
+        
+        if shared_model is None:
+            for node in self.nodes:
+                self._init_aggregates(node)
+        
+        # Status feed: pending (node_id, field) -> value, and hidden nodes to patch later
+        self._pending_status: Dict[tuple, Any] = {}
+        self._status_frame_scheduled = False
+        self._stale_status = set()
+        
+        # Visible rows in display order, their levels and (lazily refreshed) positions
+        self._visible_rows: List[TreeNode] = []
+        self._row_levels: List[int] = []
+        self._row_positions: Dict[TreeNode, int] = {}
+        self._positions_valid_upto = 0
+        self._defer_visible_rows = False
+        
+        # Cached sort keys, aligned with self.nodes / node.children
+        self._root_keys = []
+        if self.sort_key:
+            self._root_keys = self._sort_siblings(self.nodes)
+            for node in self.nodes:
+                self._sort_subtree(node)
+        
         self.build_tree()
     
     def _get_default_context_menu_items(self) -> List[Dict[str, Any]]:
@@ -146,13 +365,13 @@ class TreeView(Column):
                 "text": "Rename",
                 "icon": Icons.EDIT,
                 "action": self._on_rename_node,
-                "enabled": lambda n: True,
+                "enabled": lambda n: self.shared_model is None,  # Shared models are read-only
             },
             {
                 "text": "Delete",
                 "icon": Icons.DELETE,
                 "action": self._on_delete_node,
-                "enabled": lambda n: n.parent is not None,  # Do not remove root
+                "enabled": lambda n: n.parent is not None and self.shared_model is None,  # Do not remove root
             },
             {
                 "text": "Properties",
@@ -165,14 +384,69 @@ class TreeView(Column):
                 "text": "New Item",
                 "icon": Icons.ADD,
                 "action": self._on_new_item,
-                "enabled": lambda n: True,
+                "enabled": lambda n: self.shared_model is None,
             }
         ]
     
+    @staticmethod
+    def natural_sort_key(node: TreeNode) -> tuple:
+        """Sort key that puts folders first and compares digits numerically ("file2" < "file10")"""
+        parts = re.split(r"(\d+)", (node.name or "").lower())
+        return (
+            0 if node.has_children else 1,
+            tuple(int(part) if i % 2 else part for i, part in enumerate(parts))
+        )
+    
+    def _sort_siblings(self, nodes: List[TreeNode]) -> List[Any]:
+        """Sort a list of siblings in place and return their cached keys"""
+        keyed = sorted(((self.sort_key(n), n) for n in nodes), key=lambda item: item[0])
+        nodes[:] = [n for _, n in keyed]
+        return [key for key, _ in keyed]
+    
+    def _sort_subtree(self, node: TreeNode):
+        node._child_keys = self._sort_siblings(node.loaded_children)
+        for child in node.loaded_children:
+            self._sort_subtree(child)
+    
+    def _get_sibling_keys(self, parent: Optional[TreeNode]) -> List[Any]:
+        if parent is None:
+            return self._root_keys
+        if not hasattr(parent, '_child_keys'):
+            self._sort_subtree(parent)
+        return parent._child_keys
+    
+    def _insert_sort_key(self, parent: Optional[TreeNode], node: TreeNode) -> int:
+        """Cache the key of a new sibling and return its sorted position (binary search)"""
+        keys = self._get_sibling_keys(parent)
+        key = self.sort_key(node)
+        index = bisect_right(keys, key)
+        keys.insert(index, key)
+        return index
+    
+    def _reposition_node(self, node: TreeNode):
+        """Move a single node (and its widget) to its sorted position after its key changed"""
+        parent = node.parent
+        siblings = parent.children if parent else self.nodes
+        keys = self._get_sibling_keys(parent)
+        old_index = siblings.index(node)
+        key = self.sort_key(node)
+        if keys[old_index] == key:
+            return
+        
+        self._visible_remove(node)
+        siblings.pop(old_index)
+        keys.pop(old_index)
+        new_index = bisect_right(keys, key)
+        siblings.insert(new_index, node)
+        keys.insert(new_index, key)
+        
+        self._move_node_widget(parent, node, old_index, new_index)
+        self._visible_insert(node)
+    
     def build_tree(self):
-        self.controls = []
-        for node in self.nodes:
-            self.controls.append(self.create_node_widget(node))
+        live = {id(control) for control in self.controls}
+        self.controls = [self._get_node_widget(node, live, 0) for node in self.nodes]
+        self._rebuild_visible_rows()
     
     def get_node_icon(self, node: TreeNode) -> IconValue:
         """Get the appropriate icon for the node"""
@@ -185,14 +459,58 @@ class TreeView(Column):
                 return self.config.custom_icons[tag]
         
         # Default icon based on whether it has children
-        if node.children:
+        if node.has_children:
             return self.config.default_folder_icon
         else:
             return self.config.default_file_icon
     
     def create_node_widget(self, node: TreeNode) -> Column:
+        level = self.get_node_level(node)
+        node_container = self._create_node_row(node, level)
+        
+        # Container for children
+        children_column = Column(
+            controls=self._build_children_controls(node),
+            spacing=0,
+            visible=node.expanded
+        )
+        
+        # Main column containing the node and its children
+        main_column = Column(
+            controls=[node_container, children_column],
+            spacing=0
+        )
+        
+        # Save references so you can update them.
+        node._children_column = children_column
+        node._widget_cache = (node.version, level, main_column)
+        
+        return main_column
+    
+    def _get_node_widget(self, node: TreeNode, live: set, level: int) -> Column:
+        """Reuse the widget of a node rebuilt in place, re-rendering only rows whose version changed"""
+        cached = getattr(node, '_widget_cache', None)
+        if cached is None or id(cached[2]) not in live or cached[1] != level:
+            return self.create_node_widget(node)
+        
+        version, _, main_column = cached
+        if version != node.version:
+            main_column.controls[0] = self._create_node_row(node, level)
+            node._widget_cache = (node.version, level, main_column)
+        
+        # Rows further down may have changed too
+        children_column = main_column.controls[1]
+        rendered = node._rendered_count
+        child_live = {id(control) for control in children_column.controls[:rendered]}
+        children_column.controls[:rendered] = [
+            self._get_node_widget(child, child_live, level + 1) for child in node.children[:rendered]
+        ]
+        return main_column
+    
+    def _create_node_row(self, node: TreeNode, level: int) -> Container:
+        """Create the row of a node (without its children)"""
         # Determine whether to show the expansion icon
-        has_children = bool(node.children)
+        has_children = node.has_children
         
         # Expansion/collapse icon
         expand_icon = None
@@ -227,7 +545,7 @@ class TreeView(Column):
         node_container = Container(
             content=node_content,
             padding=padding.only(
-                left=self.get_node_level(node) * self.config.indent_size,
+                left=level * self.config.indent_size,
                 top=2,
                 bottom=2,
                 right=8
@@ -249,26 +567,93 @@ class TreeView(Column):
                 node_container.on_drag_over = lambda e, n=node: self.on_drag_over_handler(e, n)
                 node_container.on_drag_leave = lambda e, n=node: self.on_drag_leave_handler(e, n)
         
-        # Container for children
-        children_column = Column(
-            controls=[self.create_node_widget(child) for child in node.children],
-            spacing=0,
-            visible=node.expanded
-        )
-        
-        # Main column containing the node and its children
-        main_column = Column(
-            controls=[node_container, children_column],
-            spacing=0
-        )
-        
         # Save references so you can update them.
         node._expand_icon = expand_icon
-        node._children_column = children_column
         node._node_container = node_container
         node._node_content = node_content
         
-        return main_column
+        # Rebuilt rows keep their selection highlight
+        if node in self._selection:
+            self._apply_node_appearance(node, selected=True)
+        
+        return node_container
+    
+    def _build_children_controls(self, node: TreeNode, live: set = frozenset(), level: int = None) -> List[Any]:
+        """Create the widgets for the first page of children (reusing the `live` ones)"""
+        # Shared nodes build their children widgets on first expansion
+        node._children_pending = not node.expanded and isinstance(node, _SessionNode)
+        if node._children_pending:
+            node._rendered_count = 0
+            node._show_more_row = None
+            return []
+        
+        page_size = self.config.page_size
+        children = node.children[:page_size] if page_size else node.children
+        
+        if live:
+            controls = [self._get_node_widget(child, live, level) for child in children]
+        else:
+            controls = [self.create_node_widget(child) for child in children]
+        node._rendered_count = len(children)
+        node._show_more_row = None
+        
+        # Remaining children are reachable through the "show more" row
+        if node._rendered_count < len(node.children):
+            node._show_more_row = self._create_show_more_row(node)
+            controls.append(node._show_more_row)
+        
+        return controls
+    
+    def _create_show_more_row(self, node: TreeNode) -> Container:
+        """Create the row that renders the next page of children"""
+        return Container(
+            content=TextButton(
+                text=self._get_show_more_text(node),
+                on_click=lambda e, n=node: self.show_more_children(n),
+            ),
+            padding=padding.only(
+                left=(self.get_node_level(node) + 1) * self.config.indent_size,
+                right=8
+            ),
+            height=self.config.node_height,
+        )
+    
+    def _get_show_more_text(self, node: TreeNode) -> str:
+        remaining = len(node.children) - node._rendered_count
+        return f"Show {min(remaining, self.config.page_size or remaining)} more"
+    
+    def _sync_show_more_row(self, node: TreeNode):
+        """Add, refresh or remove the "show more" row after the children changed"""
+        remaining = len(node.children) - node._rendered_count
+        controls = node._children_column.controls
+        
+        if remaining > 0 and node._show_more_row is None:
+            node._show_more_row = self._create_show_more_row(node)
+            controls.append(node._show_more_row)
+        elif remaining > 0:
+            node._show_more_row.content.text = self._get_show_more_text(node)
+        elif node._show_more_row is not None:
+            controls.remove(node._show_more_row)
+            node._show_more_row = None
+    
+    @_transaction
+    def show_more_children(self, node: TreeNode):
+        """Render the next page of children of a node with a single update"""
+        if not hasattr(node, '_children_column'):
+            return
+        
+        start = node._rendered_count
+        end = start + (self.config.page_size or len(node.children))
+        chunk = [self.create_node_widget(child) for child in node.children[start:end]]
+        
+        controls = node._children_column.controls
+        controls[start:start] = chunk
+        node._rendered_count += len(chunk)
+        self._sync_show_more_row(node)
+        self._refresh_visible_span(node)
+        
+        if self.page:
+            node._children_column.update()
     
     def _create_default_node_content(self, node: TreeNode, expand_icon: Icon = None, node_icon: Icon = None) -> Row:
         """Create the default content for a node"""
@@ -278,6 +663,16 @@ class TreeView(Column):
         if expand_icon:
             controls.append(expand_icon)
         
+        # Tri-state checkbox (None = partially checked)
+        node._checkbox = None
+        if self.config.show_checkboxes:
+            node._checkbox = Checkbox(
+                value=self.get_check_state(node),
+                tristate=True,
+                on_change=lambda e, n=node: self.toggle_checked(n),
+            )
+            controls.append(node._checkbox)
+        
         # Add node icon
         if node_icon:
             controls.append(node_icon)
@@ -290,6 +685,23 @@ class TreeView(Column):
         )
         controls.append(node_text)
         
+        # Subtree total badges (only visible on folders)
+        node._aggregate_badges = {}
+        for aggregate in self.aggregates:
+            if aggregate.show_badge:
+                badge = Text(
+                    value=aggregate.format(node._aggregates[aggregate.name]),
+                    size=12,
+                    color=Colors.GREY_500,
+                    tooltip=aggregate.name,
+                    visible=node.has_children,
+                )
+                node._aggregate_badges[aggregate.name] = badge
+                controls.append(badge)
+        
+        # Live status badges get their own row once the node has a status
+        status_slot = len(controls)
+        
         # Additional custom content
         if node.content:
             if isinstance(node.content, list):
@@ -301,7 +713,14 @@ class TreeView(Column):
         if self.config.show_context_menu:
             controls.append(self._create_context_menu_button(node))
         
-        return Row(controls=controls, spacing=8, tight=True)
+        content_row = Row(controls=controls, spacing=8, tight=True)
+        node._status_badges = {}
+        node._status_row = None
+        node._status_slot = (content_row, status_slot)
+        self._stale_status.discard(node)
+        for field in node.status:
+            self._set_status_badge(node, field)
+        return content_row
     
     def _create_context_menu_button(self, node: TreeNode) -> PopupMenuButton:
         """Create the context menu button"""
@@ -339,27 +758,25 @@ class TreeView(Column):
             current = current.parent
         return level
     
+    @_transaction
     def on_node_click(self, e: ControlEvent, node: TreeNode):
         # Double-click operation
         if e.data == "2":  # Double click
             if self.on_double_click:
-                self.on_double_click(node)
+                self._call(self.on_double_click, node)
             return
         
         # Manage expand/collapse
-        if node.children:
-            was_expanded = node.expanded
-            node.expanded = not node.expanded
-            self.toggle_node(node)
-            
-            if node.expanded and self.on_node_expand:
-                self.on_node_expand(node)
-            elif not node.expanded and self.on_node_collapse:
-                self.on_node_collapse(node)
+        if node.has_children:
+            self.set_expanded(node, not node.expanded)
         
         # Handle selection if the node is selectable
         if node.selectable:
-            self.select_node(node, e.ctrl if hasattr(e, 'ctrl') else False)
+            self.select_node(
+                node,
+                e.ctrl if hasattr(e, 'ctrl') else False,
+                e.shift if hasattr(e, 'shift') else False
+            )
         
         if self.page:
             self.page.update()
@@ -375,15 +792,16 @@ class TreeView(Column):
             if self.hovered_node == node:
                 self.hovered_node = None
             # Only remove hover if it is not selected
-            if node not in (self.selected_nodes or [] if self.selected_nodes else [self.selected_node]):
+            if not self.is_selected(node):
                 if hasattr(node, '_node_container'):
                     node._node_container.bgcolor = Colors.TRANSPARENT
                     node._node_container.update()
     
+    @_transaction
     def on_node_long_press(self, e: ControlEvent, node: TreeNode):
         """Handles long click to display context menu"""
         if self.on_right_click:
-            self.on_right_click(node, e)
+            self._call(self.on_right_click, node, e)
         
         # Select the node
         self.select_node(node)
@@ -392,62 +810,322 @@ class TreeView(Column):
             self.page.update()
     
     def toggle_node(self, node: TreeNode):
-        if node.children and hasattr(node, '_children_column'):
+        if not node.has_children:
+            return
+        
+        if hasattr(node, '_children_column'):
+            if node.expanded and node._children_pending:
+                node._children_column.controls = self._build_children_controls(node)
             node._children_column.visible = node.expanded
             if node._expand_icon:
                 if node.expanded:
                     node._expand_icon.name = Icons.KEYBOARD_ARROW_DOWN
                 else:
                     node._expand_icon.name = Icons.KEYBOARD_ARROW_RIGHT
-                node._expand_icon.update()
-            node._children_column.update()
+                self._mark_dirty(node._expand_icon)
+            self._mark_dirty(node._children_column)
+        
+        if not self._defer_visible_rows:
+            self._refresh_visible_span(node)
+            self._flush()
+    
+    @_transaction
+    def set_expanded(self, node: TreeNode, expanded: bool):
+        """Expand or collapse a node and notify the callbacks"""
+        if not node.has_children or node.expanded == expanded:
+            return
+        
+        node.expanded = expanded
+        self.toggle_node(node)
+        
+        if node.expanded and self.on_node_expand:
+            self._call(self.on_node_expand, node)
+        elif not node.expanded and self.on_node_collapse:
+            self._call(self.on_node_collapse, node)
     
-    def select_node(self, node: TreeNode, multi_select: bool = False):
+    @property
+    def selected_nodes(self) -> Optional[List[TreeNode]]:
+        """Selected nodes in selection order (None outside of multi-selection)"""
+        if self.config.multi_select or len(self._selection) > 1:
+            return list(self._selection)
+        return None
+    
+    def is_selected(self, node: TreeNode) -> bool:
+        return node in self._selection
+    
+    @_transaction
+    def select_node(self, node: TreeNode, multi_select: bool = False, range_select: bool = False):
         if not node.selectable:
             return
         
+        if range_select and self._anchor_node is not None:
+            self.select_range(self._anchor_node, node)
+            return
+        
         if self.config.multi_select:
             multi_select = True  # Force multi-selection if enabled
         
+        self._anchor_node = node
+        
+        self._focus_node = node
+        
         if multi_select:
-            if self.selected_nodes is None:
-                self.selected_nodes = []
-            
-            if node in self.selected_nodes:
-                # Deselect
-                self.selected_nodes.remove(node)
-                self._update_node_appearance(node, selected=False)
-            else:
-                # Select
-                self.selected_nodes.append(node)
-                self._update_node_appearance(node, selected=True)
+            # Toggle the node, keeping the rest of the selection
+            self._set_node_selected(node, node not in self._selection)
+            self._flush()
             
             if self.on_node_select:
-                self.on_node_select(node, self.selected_nodes)
+                self._call(self.on_node_select, node, self.selected_nodes)
         else:
-            # Unique selection
-            if self.selected_nodes:
-                # Clear previous multiple selection
-                for selected_node in self.selected_nodes:
-                    self._update_node_appearance(selected_node, selected=False)
-                self.selected_nodes = None
-            
-            # Deselect previous node
-            if self.selected_node:
-                self._update_node_appearance(self.selected_node, selected=False)
+            # Unique selection: clear everything else in the same flush
+            for selected_node in list(self._selection):
+                if selected_node is not node:
+                    self._set_node_selected(selected_node, False)
             
             # Select new node
             self.selected_node = node
-            self._update_node_appearance(node, selected=True)
+            self._set_node_selected(node, True)
+            self._flush()
             
             if self.on_node_select:
-                self.on_node_select(node)
+                self._call(self.on_node_select, node)
     
-    def _update_node_appearance(self, node: TreeNode, selected: bool = True):
-        """Updates the node's appearance based on its selection state"""
-        if not hasattr(node, '_node_container'):
+    @_transaction
+    def select_range(self, from_node: TreeNode, to_node: TreeNode):
+        """Select every visible node between two nodes (shift-click); only `to_node` without multi_select"""
+        start, end = self._get_row_position(from_node), self._get_row_position(to_node)
+        if start is None or end is None:
             return
+        if start > end:
+            start, end = end, start
+        
+        self._focus_node = to_node
+        self._replace_selection(self._visible_rows[start:end + 1], focus_node=to_node)
+    
+    @_transaction
+    def select_all(self):
+        """Select every visible node"""
+        self._replace_selection(self._visible_rows)
+    
+    @_transaction
+    def invert_selection(self):
+        """Invert the selection of the visible nodes"""
+        self._replace_selection(
+            [n for n in self._visible_rows if n not in self._selection],
+            keep_hidden=True
+        )
+    
+    @_transaction
+    def clear_selection(self):
+        self._replace_selection([])
+    
+    def _replace_selection(
+        self,
+        nodes: List[TreeNode],
+        focus_node: TreeNode = None,
+        keep_hidden: bool = False,
+        notify: bool = True
+    ):
+        """Make `nodes` the selection, re-rendering only the rows whose state changed"""
+        target = {n: None for n in nodes if n.selectable}
+        
+        if keep_hidden:
+            for n in self._selection:
+                if n not in self._row_positions:
+                    target[n] = None
+        
+        # Single-selection trees only keep one node (ranges just move the selection)
+        if not self.config.multi_select and len(target) > 1:
+            kept = focus_node if focus_node in target else next(reversed(target))
+            target = {kept: None}
+        
+        for n in [n for n in self._selection if n not in target]:
+            self._set_node_selected(n, False)
+        for n in target:
+            if n not in self._selection:
+                self._set_node_selected(n, True)
+        
+        # Keep the selection order of the target
+        self._selection = target
+        self.selected_node = focus_node if focus_node in target else next(reversed(target), None)
+        self._flush()
         
+        if notify and self.on_node_select and self.selected_node:
+            if self.selected_nodes is None:
+                self._call(self.on_node_select, self.selected_node)
+            else:
+                self._call(self.on_node_select, self.selected_node, self.selected_nodes)
+    
+    def _set_node_selected(self, node: TreeNode, selected: bool):
+        if selected:
+            self._selection[node] = None
+        else:
+            self._selection.pop(node, None)
+            if self.selected_node is node:
+                self.selected_node = None
+        self._update_node_appearance(node, selected)
+    
+    def get_visible_nodes(self) -> List[TreeNode]:
+        """Returns the rendered nodes in display order (collapsed subtrees are skipped)"""
+        return list(self._visible_rows)
+    
+    # Visible row order, maintained incrementally for keyboard navigation and ranges
+    def _collect_rows(self, nodes: List[TreeNode], level: int, rows: List[TreeNode], levels: List[int]):
+        for node in nodes:
+            rows.append(node)
+            levels.append(level)
+            if node.expanded and node.children:
+                rendered = getattr(node, '_rendered_count', len(node.children))
+                self._collect_rows(node.children[:rendered], level + 1, rows, levels)
+    
+    def _rebuild_visible_rows(self):
+        self._visible_rows = []
+        self._row_levels = []
+        self._collect_rows(self.nodes, 0, self._visible_rows, self._row_levels)
+        self._row_positions = {node: i for i, node in enumerate(self._visible_rows)}
+        self._positions_valid_upto = len(self._visible_rows)
+        self._refresh_stale_status([n for n in self._stale_status if n in self._row_positions])
+    
+    def _get_row_position(self, node: TreeNode) -> Optional[int]:
+        """Row index of a visible node; O(1) unless rows moved since the last lookup"""
+        position = self._row_positions.get(node)
+        if position is None or position < self._positions_valid_upto:
+            return position
+        
+        # Rows after the last splice shifted, re-number them once
+        for i in range(self._positions_valid_upto, len(self._visible_rows)):
+            self._row_positions[self._visible_rows[i]] = i
+        self._positions_valid_upto = len(self._visible_rows)
+        return self._row_positions[node]
+    
+    def _get_span_end(self, position: int) -> int:
+        """First row after the visible subtree of the row at `position`"""
+        level = self._row_levels[position]
+        end = position + 1
+        while end < len(self._row_levels) and self._row_levels[end] > level:
+            end += 1
+        return end
+    
+    def _splice_rows(self, start: int, end: int, nodes: List[TreeNode], level: int):
+        """Replace rows[start:end] with the visible rows of `nodes`"""
+        rows, levels = [], []
+        self._collect_rows(nodes, level, rows, levels)
+        
+        for node in self._visible_rows[start:end]:
+            self._row_positions.pop(node, None)
+        self._visible_rows[start:end] = rows
+        self._row_levels[start:end] = levels
+        
+        # Real positions are restored lazily by _get_row_position
+        for node in rows:
+            self._row_positions[node] = start
+        self._positions_valid_upto = min(self._positions_valid_upto, start)
+        
+        # Rows coming into view catch up with deferred status changes
+        if self._stale_status:
+            self._refresh_stale_status(rows)
+    
+    def _refresh_visible_span(self, node: TreeNode):
+        """Re-collect the visible descendants of a node after it expanded, collapsed or changed children"""
+        position = self._get_row_position(node)
+        if position is None:
+            return
+        
+        rendered = getattr(node, '_rendered_count', len(node.children))
+        children = node.children[:rendered] if node.expanded else []
+        self._splice_rows(position + 1, self._get_span_end(position), children, self._row_levels[position] + 1)
+    
+    def _visible_insert(self, node: TreeNode):
+        """Insert the rows of a newly attached node if it is visible"""
+        if node in self._row_positions:
+            return
+        
+        parent = node.parent
+        siblings = parent.children if parent else self.nodes
+        index = siblings.index(node)
+        
+        if parent is None:
+            position, level = 0, 0
+        else:
+            parent_position = self._get_row_position(parent)
+            rendered = getattr(parent, '_rendered_count', len(siblings))
+            if parent_position is None or not parent.expanded or index >= rendered:
+                return
+            position, level = parent_position + 1, self._row_levels[parent_position] + 1
+        
+        # Right after the subtree of the previous sibling
+        if index > 0:
+            previous_position = self._get_row_position(siblings[index - 1])
+            if previous_position is not None:
+                position = self._get_span_end(previous_position)
+        
+        self._splice_rows(position, position, [node], level)
+    
+    def _visible_remove(self, node: TreeNode):
+        """Remove the rows of a node and its visible subtree"""
+        position = self._get_row_position(node)
+        if position is not None:
+            self._splice_rows(position, self._get_span_end(position), [], 0)
+    
+    # Keyboard navigation
+    def handle_keyboard_event(self, e: KeyboardEvent) -> bool:
+        """Keyboard navigation handler, e.g. page.on_keyboard_event = tree.handle_keyboard_event"""
+        return self.handle_key(e.key, shift=e.shift)
+    
+    @_transaction
+    def handle_key(self, key: str, shift: bool = False) -> bool:
+        """Moves the focus over the visible rows; returns True if the key was handled"""
+        rows = self._visible_rows
+        if not rows:
+            return False
+        
+        # A focus hidden by a collapse falls back to its nearest visible ancestor
+        focus = self._focus_node
+        while focus is not None and focus not in self._row_positions:
+            focus = focus.parent
+        position = self._get_row_position(focus) if focus else None
+        
+        if position is None:
+            target = 0 if key in ("Arrow Down", "Home", "Page Down") else len(rows) - 1
+        elif key == "Arrow Down":
+            target = position + 1
+        elif key == "Arrow Up":
+            target = position - 1
+        elif key == "Page Down":
+            target = position + self.config.keyboard_page_step
+        elif key == "Page Up":
+            target = position - self.config.keyboard_page_step
+        elif key == "Home":
+            target = 0
+        elif key == "End":
+            target = len(rows) - 1
+        elif key == "Arrow Right":
+            if focus.has_children and not focus.expanded:
+                self.set_expanded(focus, True)
+                return True
+            target = position + 1 if focus.has_children else position
+        elif key == "Arrow Left":
+            if focus.has_children and focus.expanded:
+                self.set_expanded(focus, False)
+                return True
+            target = self._get_row_position(focus.parent) if focus.parent else position
+        else:
+            return False
+        
+        self._focus_row(rows[max(0, min(target, len(rows) - 1))], extend=shift)
+        return True
+    
+    def _focus_row(self, node: TreeNode, extend: bool = False):
+        if extend and self._anchor_node is not None:
+            self.select_range(self._anchor_node, node)
+            return
+        
+        self._focus_node = node
+        self._anchor_node = node
+        self._replace_selection([node], focus_node=node)
+    
+    def _apply_node_appearance(self, node: TreeNode, selected: bool = True):
+        """Applies the selection style to the node's widgets without sending it"""
         if selected:
             node._node_container.bgcolor = self.config.selection_color
             # Find and update the text
@@ -464,87 +1142,672 @@ class TreeView(Column):
                     control.weight = FontWeight.NORMAL
                     control.color = None
                     break
+    
+    def _update_node_appearance(self, node: TreeNode, selected: bool = True):
+        """Updates the node's appearance; the change is sent on the next flush"""
+        if not hasattr(node, '_node_container'):
+            return
         
-        node._node_container.update()
+        self._apply_node_appearance(node, selected)
+        self._mark_dirty(node._node_container)
     
-    # Methods for node manipulation
-    def add_node(self, parent_node: TreeNode, new_node: TreeNode, index: int = None):
-        """Add a new child node and update the UI"""
-        if parent_node is None:  # Add to root
-            self.nodes.append(new_node)
-            self.controls.append(self.create_node_widget(new_node))
+    def _mark_dirty(self, *controls):
+        for control in controls:
+            self._dirty_controls[id(control)] = control
+    
+    @contextmanager
+    def batch_update(self):
+        """Groups several mutations into a single flush (and a single lock hold)"""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._commit_history_step()
+                self._flush()
+    
+    # Thread-safe mutation queue
+    def enqueue(self, operation: Union[str, Callable], *args, **kwargs):
+        """Queue a mutation from any thread, e.g. tree.enqueue("add_node", parent, node)"""
+        if isinstance(operation, str):
+            operation = getattr(self, operation)
+        
+        with self._queue_lock:
+            self._mutation_queue.append((operation, args, kwargs))
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = bool(self.page)
+        
+        if self.page:
+            self.page.run_task(self._drain_mutations)
         else:
-            if index is None:
-                parent_node.children.append(new_node)
-            else:
-                parent_node.children.insert(index, new_node)
-            
-            new_node.parent = parent_node
+            self._apply_mutation_batch()
+    
+    async def _drain_mutations(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                await asyncio.sleep(1 / self.config.mutation_rate)
+                # Waiting for the lock must not block the event loop
+                await loop.run_in_executor(None, self._apply_mutation_batch)
+                with self._queue_lock:
+                    if not self._mutation_queue:
+                        self._drain_scheduled = False
+                        return
+        except Exception:
+            # A failed mutation (e.g. removing a node already deleted) must not strand the rest
+            with self._queue_lock:
+                self._drain_scheduled = bool(self._mutation_queue) and bool(self.page)
+                restart = self._drain_scheduled
+            if restart:
+                self.page.run_task(self._drain_mutations)
+            raise
+        except asyncio.CancelledError:
+            with self._queue_lock:
+                self._drain_scheduled = False
+            raise
+    
+    def _apply_mutation_batch(self):
+        """Apply up to mutation_batch_size queued mutations as one transaction"""
+        with self.batch_update():
+            for _ in range(min(self.config.mutation_batch_size, len(self._mutation_queue))):
+                operation, args, kwargs = self._mutation_queue.popleft()
+                operation(*args, **kwargs)
+    
+    def _flush(self):
+        """Send every pending control change in a single update"""
+        if self._batch_depth:
+            return
+        
+        controls = [c for c in self._dirty_controls.values() if c.page]
+        self._dirty_controls.clear()
+        if controls and self.page:
+            self.page.update(*controls)
+    
+    # Checkbox mode
+    def _init_check_counts(self, node: TreeNode, inherited: bool = False):
+        """Compute checked/total leaf counters for a subtree (a checked folder checks its subtree)"""
+        node.checked = node.checked or inherited
+        if not node.children:
+            node._leaf_total = 1
+            node._leaf_checked = 1 if node.checked else 0
+            return
+        
+        node._leaf_total = node._leaf_checked = 0
+        for child in node.children:
+            self._init_check_counts(child, node.checked)
+            node._leaf_total += child._leaf_total
+            node._leaf_checked += child._leaf_checked
+        node.checked = node._leaf_checked == node._leaf_total
+    
+    def get_check_state(self, node: TreeNode) -> Optional[bool]:
+        """True, False or None when only part of the subtree is checked"""
+        if not hasattr(node, '_leaf_total'):
+            return node.checked
+        if node._leaf_checked == 0:
+            return False
+        if node._leaf_checked == node._leaf_total:
+            return True
+        return None
+    
+    def toggle_checked(self, node: TreeNode):
+        self.set_checked(node, self.get_check_state(node) is not True)
+    
+    @_transaction
+    def set_checked(self, node: TreeNode, checked: bool):
+        """Check or uncheck a subtree: O(subtree) downward, O(depth) upward"""
+        if not self.config.show_checkboxes:
+            return
+        
+        previous = node._leaf_checked
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            target = current._leaf_total if checked else 0
+            # A subtree already in the target state needs no visit
+            if current._leaf_checked == target and current.checked == checked:
+                continue
+            current._leaf_checked = target
+            current.checked = checked
+            current.touch()
+            self._update_checkbox(current)
+            stack.extend(current.children)
+        
+        self._propagate_check_counts(node.parent, 0, node._leaf_checked - previous)
+        self._flush()
+        
+        if self.on_node_check:
+            self._call(self.on_node_check, node, checked)
+    
+    def _propagate_check_counts(self, node: Optional[TreeNode], delta_total: int, delta_checked: int):
+        """Apply counter deltas to a node and its ancestors, re-rendering only changed states"""
+        while node is not None and (delta_total or delta_checked):
+            previous_state = self.get_check_state(node)
+            node._leaf_total += delta_total
+            node._leaf_checked += delta_checked
+            state = self.get_check_state(node)
+            if state != previous_state:
+                node.checked = state is True
+                node.touch()
+                self._update_checkbox(node)
+            node = node.parent
+    
+    def _update_checkbox(self, node: TreeNode):
+        if getattr(node, '_checkbox', None) is not None:
+            node._checkbox.value = self.get_check_state(node)
+            self._mark_dirty(node._checkbox)
+    
+    def get_checked_nodes(self) -> List[TreeNode]:
+        """Returns the checked nodes, skipping subtrees without checked leaves"""
+        result = []
+        stack = list(reversed(self.nodes))
+        while stack:
+            node = stack.pop()
+            if getattr(node, '_leaf_checked', 1 if node.checked else 0) == 0:
+                continue
+            if node.checked:
+                result.append(node)
+            stack.extend(reversed(node.children))
+        return result
+    
+    # Subtree aggregates
+    def register_aggregate(self, aggregate: TreeAggregate):
+        """Add an aggregate after construction (computes it once over the whole tree)"""
+        self._check_writable()
+        self.aggregates.append(aggregate)
+        for node in self.nodes:
+            self._init_aggregates(node)
+        
+        # Every row gains a badge, nothing can be reused
+        self.controls = []
+        self.build_tree()
+        if self.page:
+            self.update()
+    
+    def get_aggregate(self, node: TreeNode, name: str) -> float:
+        return node._aggregates[name]
+    
+    def _get_own_aggregate_values(self, node: TreeNode) -> Dict[str, float]:
+        return {aggregate.name: aggregate.get_value(node) for aggregate in self.aggregates}
+    
+    def _init_aggregates(self, node: TreeNode) -> Dict[str, float]:
+        node._aggregates = self._get_own_aggregate_values(node)
+        for child in node.children:
+            for name, value in self._init_aggregates(child).items():
+                node._aggregates[name] += value
+        return node._aggregates
+    
+    def _propagate_aggregates(self, node: Optional[TreeNode], deltas: Dict[str, float]):
+        """Apply deltas to a node and its ancestors (O(depth)), patching only their badges"""
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        while node is not None and deltas:
+            for name, delta in deltas.items():
+                node._aggregates[name] += delta
+            self._update_aggregate_badges(node)
+            node = node.parent
+    
+    def _update_aggregate_badges(self, node: TreeNode):
+        for aggregate in self.aggregates:
+            badge = getattr(node, '_aggregate_badges', {}).get(aggregate.name)
+            if badge is not None:
+                badge.value = aggregate.format(node._aggregates[aggregate.name])
+                badge.visible = node.has_children
+                self._mark_dirty(badge)
+    
+    @_transaction
+    def update_metadata(self, node: TreeNode, **values):
+        """Change metadata fields and refresh the affected totals without rebuilding the row"""
+        self._check_writable()
+        previous = self._get_own_aggregate_values(node)
+        node.metadata.update(values)
+        node.touch()
+        current = self._get_own_aggregate_values(node)
+        self._propagate_aggregates(node, {name: current[name] - previous[name] for name in current})
+        self._flush()
+    
+    # Status feed
+    def push_status(self, node_id: str, field: str, value: Any):
+        """Queue a status change from any thread; changes are coalesced per frame (last write wins)"""
+        with self._queue_lock:
+            self._pending_status[(node_id, field)] = value
+            if self._status_frame_scheduled:
+                return
+            self._status_frame_scheduled = bool(self.page)
+        
+        if self.page:
+            self.page.run_task(self._status_frame)
+        else:
+            self._apply_status_frame()
+    
+    def push_statuses(self, updates: List[tuple]):
+        """Queue several (node_id, field, value) changes"""
+        for node_id, field, value in updates:
+            self.push_status(node_id, field, value)
+    
+    async def _status_frame(self):
+        await asyncio.sleep(1 / self.config.status_fps)
+        with self._queue_lock:
+            self._status_frame_scheduled = False
+        # Like the mutation drain, the transaction waits for the lock off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self._apply_status_frame)
+    
+    @_transaction
+    def _apply_status_frame(self):
+        """Apply the coalesced changes, patching badges of visible nodes in one flush"""
+        with self._queue_lock:
+            pending, self._pending_status = self._pending_status, {}
+        for (node_id, field), value in pending.items():
+            node = self._nodes_by_id.get(node_id)
+            if node is None:
+                continue
             
-            # Create the widget for the new node
-            new_node_widget = self.create_node_widget(new_node)
+            if value is None:
+                node.status.pop(field, None)
+            else:
+                node.status[field] = value
+            node.touch()
             
-            # Add the new widget to the child column
-            if index is None:
-                parent_node._children_column.controls.append(new_node_widget)
+            # Hidden rows are patched once they become visible
+            if node in self._row_positions:
+                self._set_status_badge(node, field)
             else:
-                parent_node._children_column.controls.insert(index, new_node_widget)
+                self._stale_status.add(node)
+        self._flush()
+    
+    def _set_status_badge(self, node: TreeNode, field: str):
+        if not hasattr(node, '_status_slot'):
+            return
+        content_row, status_slot = node._status_slot
+        
+        badge = node._status_badges.get(field)
+        if field not in node.status:
+            if badge is not None:
+                node._status_row.controls.remove(node._status_badges.pop(field))
+                self._mark_dirty(node._status_row)
+                if not node._status_badges:
+                    # No status left: the row goes away with its spacing
+                    content_row.controls.remove(node._status_row)
+                    node._status_row = None
+                    self._mark_dirty(content_row)
+            return
+        
+        text = self.status_formatter(field, node.status[field])
+        if badge is None:
+            if node._status_row is None:
+                node._status_row = Row(spacing=4, tight=True)
+                content_row.controls.insert(status_slot, node._status_row)
+                self._mark_dirty(content_row)
+            node._status_badges[field] = Text(value=text, size=12, tooltip=field)
+            node._status_row.controls.append(node._status_badges[field])
+            self._mark_dirty(node._status_row)
+        elif badge.value != text:
+            badge.value = text
+            self._mark_dirty(badge)
+    
+    def _refresh_stale_status(self, nodes: List[TreeNode]):
+        for node in nodes:
+            if node in self._stale_status:
+                self._stale_status.discard(node)
+                for field in set(node.status) | set(getattr(node, '_status_badges', {})):
+                    self._set_status_badge(node, field)
+    
+    # Methods for node manipulation
+    def _index_subtree(self, node: TreeNode):
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._nodes_by_id.setdefault(current.id, current)
+            stack.extend(current.loaded_children)
+    
+    def _unindex_subtree(self, node: TreeNode):
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if self._nodes_by_id.get(current.id) is current:
+                del self._nodes_by_id[current.id]
+            stack.extend(current.loaded_children)
+    
+    def _load_children(self, node: _SessionNode) -> List[TreeNode]:
+        """Create the session nodes of a shared node's children"""
+        children = [_SessionNode(child, node, self) for child in node.source.children]
+        for child in children:
+            self._nodes_by_id.setdefault(child.id, child)
+        if self.sort_key:
+            node._child_keys = self._sort_siblings(children)
+        return children
+    
+    def _check_writable(self):
+        if self.shared_model is not None:
+            raise ValueError("A TreeView over a shared model is read-only")
+    
+    def _attach_node(self, parent_node: Optional[TreeNode], node: TreeNode, index: int = None):
+        """Link a node under a parent (or the roots), creating its widget and rows"""
+        if self.sort_key:
+            # The sorted position replaces any caller-supplied index
+            index = self._insert_sort_key(parent_node, node)
+        
+        if parent_node is None:  # Add to root
+            if index is None:
+                index = len(self.nodes)
+            node.parent = None
+            self.nodes.insert(index, node)
+            self._insert_node_widget(None, node, index)
+            self._visible_insert(node)
+            return
+        
+        was_leaf = not parent_node.children
+        previous_own = self._get_own_aggregate_values(parent_node)
+        if index is None:
+            parent_node.children.append(node)
+        else:
+            parent_node.children.insert(index, node)
+        
+        node.parent = parent_node
+        parent_node.touch()
+        
+        if self.config.show_checkboxes:
+            # A leaf parent stops counting as a leaf itself
+            own_total, own_checked = (1, 1 if parent_node.checked else 0) if was_leaf else (0, 0)
+            self._propagate_check_counts(
+                parent_node,
+                node._leaf_total - own_total,
+                node._leaf_checked - own_checked
+            )
+        
+        # The parent's own value may change with its leaf status
+        own = self._get_own_aggregate_values(parent_node)
+        self._propagate_aggregates(parent_node, {
+            name: node._aggregates[name] + own[name] - previous_own[name] for name in own
+        })
+        if was_leaf:
+            self._update_aggregate_badges(parent_node)
+        
+        position = len(parent_node.children) - 1 if index is None else index
+        self._insert_node_widget(parent_node, node, position)
+        self._visible_insert(node)
+        
+        # A leaf that gained its first child may sort differently now
+        if self.sort_key and was_leaf:
+            self._reposition_node(parent_node)
+    
+    def _detach_node(self, node: TreeNode) -> Optional[TreeNode]:
+        """Unlink a node from its parent (or the roots), dropping its widget and rows"""
+        self._visible_remove(node)
+        
+        parent = node.parent
+        siblings = parent.children if parent else self.nodes
+        previous_own = self._get_own_aggregate_values(parent) if parent else {}
+        index = siblings.index(node)
+        siblings.pop(index)
+        if self.sort_key:
+            self._get_sibling_keys(parent).pop(index)
+        
+        if parent is not None:
+            own = self._get_own_aggregate_values(parent)
+            self._propagate_aggregates(parent, {
+                name: own[name] - previous_own[name] - node._aggregates[name] for name in own
+            })
+            if not parent.children:
+                self._update_aggregate_badges(parent)
+        
+        self._remove_node_widget(parent, index)
+        node.parent = None
+        if parent is not None:
+            parent.touch()
+        
+        if self.config.show_checkboxes and parent is not None:
+            # A folder without children counts as a leaf again
+            own_total, own_checked = (1, 1 if parent.checked else 0) if not parent.children else (0, 0)
+            self._propagate_check_counts(
+                parent,
+                own_total - node._leaf_total,
+                own_checked - node._leaf_checked
+            )
+        
+        # A folder that lost its last child may sort differently now
+        if self.sort_key and parent is not None and not parent.children:
+            self._reposition_node(parent)
+        
+        return parent
+    
+    # Widget hooks (TreeGrid renders rows itself and overrides them)
+    def _insert_node_widget(self, parent: Optional[TreeNode], node: TreeNode, position: int):
+        """Create the widget of an attached node if it falls inside the rendered page"""
+        if parent is None:
+            self.controls.insert(position, self.create_node_widget(node))
+            self._mark_dirty(self)
+            return
+        if not hasattr(parent, '_children_column'):
+            return
+        
+        if parent._show_more_row is None or position < parent._rendered_count:
+            parent._children_column.controls.insert(position, self.create_node_widget(node))
+            parent._rendered_count += 1
+        self._sync_show_more_row(parent)
+        self._mark_dirty(parent._children_column)
+    
+    def _remove_node_widget(self, parent: Optional[TreeNode], index: int):
+        """Drop the widget of a detached node if it was rendered"""
+        if parent is None:
+            self.controls.pop(index)
+            self._mark_dirty(self)
+            return
+        if not hasattr(parent, '_children_column'):
+            return
+        
+        if index < parent._rendered_count:
+            parent._children_column.controls.pop(index)
+            parent._rendered_count -= 1
+        self._sync_show_more_row(parent)
+        self._mark_dirty(parent._children_column)
+    
+    def _replace_node_widget(self, node: TreeNode):
+        """Re-render the row of a node whose properties changed, keeping its children widgets"""
+        if node.parent is None:
+            if node not in self.nodes:
+                return
+            main_column = self.controls[self.nodes.index(node)]
+        else:
+            if not hasattr(node.parent, '_children_column'):
+                return
+            
+            # Nodes beyond the rendered page have no widget yet
+            index = node.parent.children.index(node)
+            if index >= node.parent._rendered_count:
+                return
+            main_column = node.parent._children_column.controls[index]
+        
+        level = self.get_node_level(node)
+        main_column.controls[0] = self._create_node_row(node, level)
+        node._widget_cache = (node.version, level, main_column)
+        self._mark_dirty(main_column)
+    
+    def _move_node_widget(self, parent: Optional[TreeNode], node: TreeNode, old_index: int, new_index: int):
+        """Move the widget of a node between sibling positions, reusing it when possible"""
+        if parent is None:
+            self.controls.insert(new_index, self.controls.pop(old_index))
+            self._mark_dirty(self)
+            return
+        if not hasattr(parent, '_children_column'):
+            return
+        
+        # Reuse the existing widget, respecting the rendered page
+        controls = parent._children_column.controls
+        widget = None
+        if old_index < parent._rendered_count:
+            widget = controls.pop(old_index)
+            parent._rendered_count -= 1
+        if parent._show_more_row is None or new_index < parent._rendered_count:
+            controls.insert(new_index, widget or self.create_node_widget(node))
+            parent._rendered_count += 1
+        self._sync_show_more_row(parent)
+        self._mark_dirty(parent._children_column)
+    
+    def add_node(self, parent_node: TreeNode, new_node: TreeNode, index: int = None):
+        """Add a new child node and update the UI"""
+        self._check_writable()
+        with self.batch_update():
+            if self.sort_key:
+                self._sort_subtree(new_node)
+            if self.config.show_checkboxes:
+                self._init_check_counts(new_node)
+            self._init_aggregates(new_node)
+            self._attach_node(parent_node, new_node, index)
+            self._index_subtree(new_node)
+            self._record(("remove", new_node), ("place", new_node, *self._get_position(new_node)))
             
             # Expand the parent node if it is not expanded
-            if not parent_node.expanded and parent_node.children:
+            if parent_node is not None and not parent_node.expanded and parent_node.children:
                 parent_node.expanded = True
                 self.toggle_node(parent_node)
-        
-        if self.page:
-            self.page.update()
+                self._record(("expand", parent_node, False), ("expand", parent_node, True))
         
         return new_node
     
     def remove_node(self, node: TreeNode):
         """Remove a node and update the UI"""
-        if node.parent:
-            # Remove from parent's children list
-            node.parent.children.remove(node)
+        self._check_writable()
+        with self.batch_update():
+            self._record(("place", node, *self._get_position(node)), ("remove", node))
+            self._detach_node(node)
+            self._unindex_subtree(node)
             
-            # Find and remove the corresponding widget
-            for i, control in enumerate(node.parent._children_column.controls):
-                if hasattr(control.controls[0].data, 'id') and control.controls[0].data.id == node.id:
-                    node.parent._children_column.controls.pop(i)
-                    break
-            
-            # Update UI
-            node.parent._children_column.update()
-        else:
-            # Is root node
-            for i, n in enumerate(self.nodes):
-                if n.id == node.id:
-                    self.nodes.pop(i)
-                    self.controls.pop(i)
-                    break
-        
-        if self.page:
-            self.page.update()
+            # Removed nodes can no longer stay selected
+            for selected_node in [n for n in self._selection if n is node or self.is_ancestor(node, n)]:
+                self._selection.pop(selected_node)
+                if self.selected_node is selected_node:
+                    self.selected_node = None
     
+    @_transaction
     def update_node(self, node: TreeNode, **kwargs):
         """Update the properties of a node"""
-        for key, value in kwargs.items():
-            if hasattr(node, key):
-                setattr(node, key, value)
+        self._check_writable()
+        self._visible_remove(node)
         
-        # Recreate the widget if necessary
-        if node.parent:
-            # Find the index of the node in the children of the parent
-            index = node.parent.children.index(node)
-            
-            # Recreate the widget
-            new_widget = self.create_node_widget(node)
-            
-            # Replace the old widget
-            node.parent._children_column.controls[index] = new_widget
-            node.parent._children_column.update()
+        if "id" in kwargs and self._nodes_by_id.get(node.id) is node:
+            del self._nodes_by_id[node.id]
         
-        if self.page:
-            self.page.update()
+        previous_own = self._get_own_aggregate_values(node)
+        changes = {key: value for key, value in kwargs.items() if hasattr(node, key)}
+        self._record(
+            ("update", node, {key: getattr(node, key) for key in changes}),
+            ("update", node, changes)
+        )
+        for key, value in changes.items():
+            setattr(node, key, value)
+        node.touch()
+        self._nodes_by_id.setdefault(node.id, node)
+        
+        # Changed metadata only touches the ancestors' totals
+        own = self._get_own_aggregate_values(node)
+        self._propagate_aggregates(node, {name: own[name] - previous_own[name] for name in own})
+        
+        # Renames only move the node itself to its new sorted position
+        if self.sort_key:
+            self._reposition_node(node)
+        
+        self._replace_node_widget(node)
+        self._visible_insert(node)
+        self._flush()
+    
+    # Undo / redo history
+    def _record(self, undo_operation: tuple, redo_operation: tuple):
+        """Remember the inverse of a model mutation in the current step"""
+        if self._replaying or not self.config.history_limit:
+            return
+        self._pending_step.append((undo_operation, redo_operation))
+    
+    def _commit_history_step(self):
+        """Close the step of the outermost transaction (all its mutations undo together)"""
+        if not self._pending_step:
+            return
+        step, self._pending_step = self._pending_step, []
+        self._undo_stack.append(step)
+        self._history_operations += len(step)
+        self._redo_stack.clear()
+        
+        # Drop the oldest steps beyond the caps (the latest step is always kept)
+        while len(self._undo_stack) > 1 and (
+            len(self._undo_stack) > self.config.history_limit
+            or self._history_operations > self.config.history_max_operations
+        ):
+            self._history_operations -= len(self._undo_stack.popleft())
+    
+    def _forget_operation(self, node: TreeNode, kind: str):
+        """Drop the latest recorded `kind` mutation of a node, wherever it is in the history"""
+        # Newest first: the redo stack (latest undone first), then the undo stack
+        stacks = [(self._redo_stack, range(len(self._redo_stack))),
+                  (self._undo_stack, range(len(self._undo_stack) - 1, -1, -1))]
+        for stack, positions in stacks:
+            for position in positions:
+                step = stack[position]
+                for i in range(len(step) - 1, -1, -1):
+                    redo_operation = step[i][1]
+                    if redo_operation[0] != kind or redo_operation[1] is not node:
+                        continue
+                    del step[i]
+                    if stack is self._undo_stack:
+                        self._history_operations -= 1
+                    if not step:
+                        del stack[position]
+                    return
+    
+    def _replay(self, operation: tuple):
+        kind, node = operation[0], operation[1]
+        if kind == "remove":
+            self.remove_node(node)
+        elif kind == "place":
+            self._restore_node(node, operation[2], operation[3])
+        elif kind == "update":
+            self.update_node(node, **operation[2])
+        elif kind == "expand" and node.expanded != operation[2]:
+            node.expanded = operation[2]
+            self.toggle_node(node)
+    
+    def can_undo(self) -> bool:
+        return bool(self._undo_stack)
+    
+    def can_redo(self) -> bool:
+        return bool(self._redo_stack)
+    
+    @_transaction
+    def undo(self) -> bool:
+        """Revert the last step as incremental patches in a single flush"""
+        if not self._undo_stack:
+            return False
+        step = self._undo_stack.pop()
+        self._history_operations -= len(step)
+        self._replaying = True
+        try:
+            for undo_operation, _ in reversed(step):
+                self._replay(undo_operation)
+        finally:
+            self._replaying = False
+        self._redo_stack.append(step)
+        return True
+    
+    @_transaction
+    def redo(self) -> bool:
+        """Apply the last undone step again in a single flush"""
+        if not self._redo_stack:
+            return False
+        step = self._redo_stack.pop()
+        self._replaying = True
+        try:
+            for _, redo_operation in step:
+                self._replay(redo_operation)
+        finally:
+            self._replaying = False
+        self._undo_stack.append(step)
+        self._history_operations += len(step)
+        return True
+    
+    def clear_history(self):
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+        self._history_operations = 0
     
     # Context menu methods
     def _on_rename_node(self, node: TreeNode):
@@ -555,7 +1818,15 @@ class TreeView(Column):
             self.show_rename_dialog(node)
     
     def _on_delete_node(self, node: TreeNode):
-        if self.on_delete:
+        if self.on_delete and self._is_deferred(self.on_delete):
+            # Optimistic delete, restored if the callback returns False
+            parent, index = self._get_position(node)
+            self.remove_node(node)
+            self._call(
+                self.on_delete, node,
+                on_result=lambda ok: ok is False and self._rollback_node(node, parent, index, "remove")
+            )
+        elif self.on_delete:
             # Use custom callback
             if self.on_delete(node):
                 self.remove_node(node)
@@ -564,23 +1835,83 @@ class TreeView(Column):
     
     def _on_properties_node(self, node: TreeNode):
         if self.on_properties:
-            self.on_properties(node)
+            self._call(self.on_properties, node)
         else:
             self.show_properties_dialog(node)
     
     def _on_new_item(self, parent_node: TreeNode):
         if self.on_new_item:
             # The callback should return the new node or None.
-            new_node = self.on_new_item(parent_node, "item", "Item")
-            if new_node:
-                self.add_node(parent_node, new_node)
+            self._call(
+                self.on_new_item, parent_node, "item", "Item",
+                on_result=lambda new_node: new_node and self.add_node(parent_node, new_node)
+            )
         else:
             self.show_new_item_dialog(parent_node)
     
+    # User callbacks
+    @staticmethod
+    def threaded(callback: Callable) -> Callable:
+        """Decorator that runs a sync callback in a worker thread instead of the event handler"""
+        callback._tree_view_threaded = True
+        return callback
+    
+    def _is_deferred(self, callback: Callable) -> bool:
+        return asyncio.iscoroutinefunction(callback) or getattr(callback, '_tree_view_threaded', False)
+    
+    def _call(self, callback: Optional[Callable], *args, on_result: Optional[Callable[[Any], Any]] = None):
+        """Run a user callback; coroutines and threaded callbacks don't block the event handler"""
+        if callback is None:
+            return None
+        
+        if not self._is_deferred(callback) or not self.page:
+            if asyncio.iscoroutinefunction(callback):
+                return None  # Nothing can await it before the control is mounted
+            result = callback(*args)
+            if on_result:
+                on_result(result)
+            return result
+        
+        async def run_callback():
+            loop = asyncio.get_running_loop()
+            if asyncio.iscoroutinefunction(callback):
+                result = await callback(*args)
+            else:
+                result = await loop.run_in_executor(None, partial(callback, *args))
+            if on_result:
+                # Results usually mutate the tree: take the lock off the event loop
+                await loop.run_in_executor(None, on_result, result)
+        
+        self.page.run_task(run_callback)
+        return None
+    
+    def _get_position(self, node: TreeNode) -> tuple:
+        siblings = node.parent.children if node.parent else self.nodes
+        return node.parent, siblings.index(node)
+    
+    def _restore_node(self, node: TreeNode, parent: Optional[TreeNode], index: int):
+        """Put a node back where it was (rollback of an optimistic delete or move)"""
+        with self.batch_update():
+            attached = node.parent is not None or node in self.nodes
+            if attached:
+                self._detach_node(node)
+            self._attach_node(parent, node, index)
+            if not attached:
+                self._index_subtree(node)
+    
+    def _rollback_node(self, node: TreeNode, parent: Optional[TreeNode], index: int, kind: str):
+        """Put back a node whose optimistic `kind` mutation was refused, and drop it from the history"""
+        with self.batch_update():
+            self._restore_node(node, parent, index)
+            self._forget_operation(node, kind)
+    
     # Drag & drop handlers
     def on_drag_start_handler(self, e: ControlEvent, node: TreeNode):
         if self.on_drag_start:
-            if not self.on_drag_start(node):
+            # Only sync callbacks can cancel the drag
+            if self._is_deferred(self.on_drag_start):
+                self._call(self.on_drag_start, node)
+            elif not self.on_drag_start(node):
                 return
         
         # Configure drag data
@@ -589,6 +1920,7 @@ class TreeView(Column):
             "node_name": node.name,
         }
     
+    @_transaction
     def on_drop_handler(self, e: ControlEvent, target_node: TreeNode):
         if not target_node.droppable:
             return
@@ -603,13 +1935,26 @@ class TreeView(Column):
         if not dragged_node or dragged_node == target_node:
             return
         
+        # Dragging a selected node moves the whole selection
+        nodes = self.get_selected_nodes() if self.is_selected(dragged_node) else [dragged_node]
+        nodes = self._get_movable_nodes(nodes, target_node)
+        
+        if self.on_drop and self._is_deferred(self.on_drop):
+            # Optimistic move, each node goes back if its callback returns False
+            origins = {n: self._get_position(n) for n in nodes}
+            for n in self.move_nodes(nodes, target_node):
+                self._call(
+                    self.on_drop, n, target_node,
+                    on_result=lambda ok, n=n: ok is False and self._rollback_node(n, *origins[n], "place")
+                )
+            return
+        
         # Verify callback
         if self.on_drop:
-            if not self.on_drop(dragged_node, target_node):
-                return
+            nodes = [n for n in nodes if self.on_drop(n, target_node)]
         
-        # Move node
-        self.move_node(dragged_node, target_node)
+        # Move nodes
+        self.move_nodes(nodes, target_node)
     
     def on_drag_over_handler(self, e: ControlEvent, node: TreeNode):
         if node.droppable:
@@ -621,7 +1966,7 @@ class TreeView(Column):
     def on_drag_leave_handler(self, e: ControlEvent, node: TreeNode):
         if hasattr(node, '_node_container'):
             # Restore original color (considering selection/hover)
-            if node in (self.selected_nodes or [] if self.selected_nodes else [self.selected_node]):
+            if self.is_selected(node):
                 node._node_container.bgcolor = self.config.selection_color
             elif node == self.hovered_node:
                 node._node_container.bgcolor = self.config.hover_color
@@ -631,47 +1976,125 @@ class TreeView(Column):
     
     def move_node(self, node: TreeNode, new_parent: TreeNode):
         """Move a node to a new parent"""
-        # Delete from current parent
-        old_parent = node.parent
-        if old_parent:
-            old_parent.children.remove(node)
-            # Update the parent UI of the old parent
-            self._refresh_node_children(old_parent)
-        else:
-            # is root node
-            self.nodes.remove(node)
-            self.controls = []
-            self.build_tree()
+        self.move_nodes([node], new_parent)
+    
+    def move_nodes(self, nodes: List[TreeNode], new_parent: Optional[TreeNode]) -> List[TreeNode]:
+        """Move several nodes to a new parent (None = roots) in a single update"""
+        self._check_writable()
+        nodes = self._get_movable_nodes(nodes, new_parent)
+        if not nodes:
+            return []
         
-        # Add new parent
-        new_parent.children.append(node)
-        node.parent = new_parent
+        with self.batch_update():
+            for node in nodes:
+                origin = self._get_position(node)
+                self._detach_node(node)
+                self._attach_node(new_parent, node)
+                self._record(("place", node, *origin), ("place", node, *self._get_position(node)))
+            
+            # Expand the new parent if it is not already expanded
+            if new_parent is not None and not new_parent.expanded:
+                new_parent.expanded = True
+                self.toggle_node(new_parent)
+                self._record(("expand", new_parent, False), ("expand", new_parent, True))
         
-        # Update the new parent's UI
-        self._refresh_node_children(new_parent)
+        return nodes
+    
+    def is_ancestor(self, ancestor: TreeNode, node: TreeNode) -> bool:
+        """True if `ancestor` is above `node`, walking parent pointers (O(depth))"""
+        current = node.parent
+        while current is not None:
+            if current is ancestor:
+                return True
+            current = current.parent
+        return False
+    
+    def _get_movable_nodes(self, nodes: List[TreeNode], new_parent: Optional[TreeNode]) -> List[TreeNode]:
+        """Drops moves that would create a cycle, are no-ops or are covered by a moved ancestor"""
+        # The target and its ancestors can never be moved into the target
+        blocked = set()
+        current = new_parent
+        while current is not None:
+            blocked.add(current)
+            current = current.parent
         
-        # Expand the new parent if it is not already expanded
-        if not new_parent.expanded:
-            new_parent.expanded = True
-            self.toggle_node(new_parent)
+        candidates = [
+            node for node in nodes
+            if node not in blocked and not (node.parent is new_parent and new_parent is not None)
+        ]
         
-        if self.page:
-            self.page.update()
+        # Nodes inside another moved subtree travel with it; refused nodes carry nothing
+        moving = set(candidates)
+        movable = []
+        for node in candidates:
+            ancestor = node.parent
+            while ancestor is not None and ancestor not in moving:
+                ancestor = ancestor.parent
+            if ancestor is None:
+                movable.append(node)
+        return movable
     
     def _refresh_node_children(self, node: TreeNode):
         """Recreates the child widgets of a node"""
         if not hasattr(node, '_children_column'):
             return
         
-        node._children_column.controls = [
-            self.create_node_widget(child) for child in node.children
-        ]
+        live = {id(control) for control in node._children_column.controls}
+        node._children_column.controls = self._build_children_controls(node, live, self.get_node_level(node) + 1)
         node._children_column.update()
+        self._refresh_visible_span(node)
+    
+    # View state persistence
+    def get_view_state(self) -> Dict[str, List[str]]:
+        """Captures the expanded and selected node ids (JSON-friendly)"""
+        return {
+            "expanded": [node.id for node in self.iter_nodes() if node.expanded and node.has_children],
+            "selected": [node.id for node in self._selection],
+        }
+    
+    @_transaction
+    def apply_view_state(self, state: Dict[str, List[str]]):
+        """Restores a view state in one pass and one flush; unknown ids are skipped"""
+        expanded = set(state.get("expanded", ()))
+        
+        # Load the shared nodes that have to be expanded
+        if self.shared_model is not None:
+            for node_id in expanded:
+                self.find_node_by_id(node_id)
+        
+        # Toggle widgets only, the visible rows are rebuilt once afterwards
+        self._defer_visible_rows = True
+        try:
+            for node in self.iter_nodes():
+                should_expand = node.id in expanded and node.has_children
+                if node.expanded != should_expand:
+                    node.expanded = should_expand
+                    self.toggle_node(node)
+        finally:
+            self._defer_visible_rows = False
+        self._rebuild_visible_rows()
+        
+        selected = [self._nodes_by_id[i] for i in state.get("selected", ()) if i in self._nodes_by_id]
+        self._replace_selection(selected, notify=False)
+        self._focus_node = self._anchor_node = self.selected_node
     
     # Useful methods
+    def iter_nodes(self):
+        """Yields every node in display order, expanded or not (only the loaded part of a shared model)"""
+        stack = list(reversed(self.nodes))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.loaded_children))
+    
     def find_node_by_id(self, node_id: str, nodes: List[TreeNode] = None) -> Optional[TreeNode]:
         """Find a node by its ID"""
-        nodes = nodes or self.nodes
+        if not nodes:
+            node = self._nodes_by_id.get(node_id)
+            if node is None and self.shared_model is not None:
+                node = self._load_shared_node(node_id)
+            return node
+        
         for node in nodes:
             if node.id == node_id:
                 return node
@@ -681,49 +2104,77 @@ class TreeView(Column):
                     return found
         return None
     
+    def _load_shared_node(self, node_id: str) -> Optional[TreeNode]:
+        """Load the session nodes on the path to a shared node"""
+        source = self.shared_model.find_node_by_id(node_id)
+        if source is None:
+            return None
+        
+        path = []
+        current = source.parent
+        while current is not None:
+            path.append(current)
+            current = current.parent
+        
+        # Loading a node's children indexes them, from the root down
+        for ancestor in reversed(path):
+            self._nodes_by_id[ancestor.id].children
+        return self._nodes_by_id.get(node_id)
+    
     def find_nodes_by_tag(self, tag: str, nodes: List[TreeNode] = None) -> List[TreeNode]:
         """Find all nodes with a specific tag"""
+        if self.shared_model is not None:
+            # Search the shared nodes and only load the paths to the matches
+            sources = [node.source for node in nodes] if nodes else self.shared_model.nodes
+            return [self._load_shared_node(source.id) for source in self._find_tagged(tag, sources)]
+        return self._find_tagged(tag, nodes or self.nodes)
+    
+    def _find_tagged(self, tag: str, nodes: List[TreeNode]) -> List[TreeNode]:
         result = []
-        nodes = nodes or self.nodes
-        for node in nodes:
+        stack = list(reversed(nodes))
+        while stack:
+            node = stack.pop()
             if tag in node.tags:
                 result.append(node)
-            if node.children:
-                result.extend(self.find_nodes_by_tag(tag, node.children))
+            stack.extend(reversed(node.children))
         return result
     
     def get_selected_nodes(self) -> List[TreeNode]:
         """Returns the selected nodes"""
-        if self.config.multi_select:
-            return self.selected_nodes or []
-        else:
-            return [self.selected_node] if self.selected_node else []
+        return list(self._selection)
     
+    @_transaction
     def expand_all(self):
         """Expand all nodes"""
         def expand_recursive(nodes: List[TreeNode]):
             for node in nodes:
-                if node.children:
+                if node.has_children:
                     node.expanded = True
                     self.toggle_node(node)
                     expand_recursive(node.children)
         
+        # Rebuild the visible rows once instead of splicing per node
+        self._defer_visible_rows = True
         expand_recursive(self.nodes)
-        if self.page:
-            self.page.update()
+        self._defer_visible_rows = False
+        self._rebuild_visible_rows()
+        self._flush()
     
+    @_transaction
     def collapse_all(self):
         """Collapse all nodes"""
         def collapse_recursive(nodes: List[TreeNode]):
             for node in nodes:
-                if node.children:
+                if node.has_children:
                     node.expanded = False
                     self.toggle_node(node)
-                    collapse_recursive(node.children)
+                    collapse_recursive(node.loaded_children)
         
+        self._defer_visible_rows = True
         collapse_recursive(self.nodes)
-        if self.page:
-            self.page.update()
+        self._defer_visible_rows = False
+        self._rebuild_visible_rows()
+        self._flush()
     
     # Dialogues (may be overwritten)
     def show_rename_dialog(self, node: TreeNode):
@@ -731,13 +2182,19 @@ class TreeView(Column):
         def rename_action(e):
             if new_name_field.value.strip():
                 new_name = new_name_field.value.strip()
-                if self.on_rename:
+                if self.on_rename and self._is_deferred(self.on_rename):
+                    # Optimistic rename, reverted if the callback returns False
+                    old_name = node.name
+                    self.update_node(node, name=new_name)
+                    self._call(
+                        self.on_rename, node, new_name,
+                        on_result=lambda ok: ok is False and self.update_node(node, name=old_name)
+                    )
+                elif self.on_rename:
                     if self.on_rename(node, new_name):
-                        node.name = new_name
-                        self.update_node(node)
+                        self.update_node(node, name=new_name)
                 else:
-                    node.name = new_name
-                    self.update_node(node)
+                    self.update_node(node, name=new_name)
                 self.page.close(dlg)
                 self.page.update()
         
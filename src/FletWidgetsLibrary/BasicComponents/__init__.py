@@ -1,6 +1,7 @@
 from .RestrictedInput import RestrictedInput, BaseValidator, RestrictedInputEvent 
 from .Stepper import Stepper, StepperStepCard, StepperEvent
-from .TreeView import TreeView, TreeNode, TreeViewConfig
+from .TreeView import TreeView, TreeNode, TreeViewConfig, TreeAggregate, SharedTreeModel
+from .TreeGrid import TreeGrid, TreeGridColumn
 from .BasicButton import BasicButton
 
-__all__ = ["RestrictedInput", "BasicButton", "Stepper", "StepperStepCard", "StepperEvent", "BaseValidator", "RestrictedInputEvent", "TreeView", "TreeNode", "TreeViewConfig"]
\ No newline at end of file
+__all__ = ["RestrictedInput", "BasicButton", "Stepper", "StepperStepCard", "StepperEvent", "BaseValidator", "RestrictedInputEvent", "TreeView", "TreeNode", "TreeViewConfig", "TreeAggregate", "SharedTreeModel", "TreeGrid", "TreeGridColumn"]
\ No newline at end of file
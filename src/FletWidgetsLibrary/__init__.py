@@ -1,6 +1,7 @@
 from .AnimatedComponents import (
     HighlightRotatingText, 
     AnimatedTextBubble, 
+    ChatView,
     ImagesSlider,
     TypeWriter, 
     TextFader, 
@@ -8,7 +9,9 @@ from .AnimatedComponents import (
     OrdenedList,
     UnorderedList,
     ListItem,
-    CircleCard
+    CircleCard,
+    AnimationScheduler,
+    ToastQueue
 )
 from .BasicComponents import (
     RestrictedInput,
@@ -20,7 +23,11 @@ from .BasicComponents import (
     BaseValidator,
     TreeNode,
     TreeView,
-    TreeViewConfig
+    TreeViewConfig,
+    TreeAggregate,
+    SharedTreeModel,
+    TreeGrid,
+    TreeGridColumn
 )
 from .OauthProvidersButtons import (
     OauthProviderButton,
@@ -43,6 +50,7 @@ __all__ = [
     "TextFader",
     "TypeWriter",
     "AnimatedTextBubble",
+    "ChatView",
     "SplitText",
     "HighlightRotatingText",
     "ImagesSlider",
@@ -57,6 +65,8 @@ __all__ = [
     "RestrictedInputEvent",
     "BaseValidator",
     "CircleCard",
+    "AnimationScheduler",
+    "ToastQueue",
     "OauthProviderButton",
     "MicrosoftButton",
     "LinkedinButton",
@@ -73,5 +83,9 @@ __all__ = [
     "CupertinoAppleButton",
     "TreeNode",
     "TreeView",
-    "TreeViewConfig"
+    "TreeViewConfig",
+    "TreeAggregate",
+    "SharedTreeModel",
+    "TreeGrid",
+    "TreeGridColumn"
 ]
\ No newline at end of file